@@ -19,13 +19,16 @@
 #   Doc pydantic-settings : https://docs.pydantic.dev/latest/concepts/pydantic_settings/
 #
 # Utilisation :
-#   from app.config import settings
-#   print(settings.port)   # → 8000 (ou la valeur de la variable PORT)
+#   from app.config import get_settings
+#   print(get_settings().port)   # → 8000 (ou la valeur de la variable PORT)
 #
 # =============================================================================
 
-from pydantic import Field
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from functools import lru_cache
+from typing import Annotated
+
+from pydantic import Field, field_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -67,6 +70,18 @@ class Settings(BaseSettings):
         description="Seed du générateur aléatoire (None = aléatoire, entier = déterministe)",
     )
 
+    # Validation des lignes générées par les modèles Pydantic de réponse.
+    # Variable d'environnement : VALIDATE_RESPONSES
+    # True (défaut, dev/tests) : chaque réponse est validée contre son modèle
+    #   (app/models/responses.py) — un écart entre générateur et spec est
+    #   détecté immédiatement.
+    # False (production, voir docker-compose.yml) : les lignes, produites par
+    #   notre propre générateur, sont sérialisées directement avec orjson.
+    validate_responses: bool = Field(
+        default=True,
+        description="Valider les réponses contre les modèles Pydantic (False = orjson direct)",
+    )
+
     # -------------------------------------------------------------------------
     # Paramètres CORS
     # -------------------------------------------------------------------------
@@ -77,21 +92,42 @@ class Settings(BaseSettings):
     #   CORS_ORIGINS=*                          → tout autoriser (développement)
     #   CORS_ORIGINS=http://localhost:3000      → une seule origine
     #   CORS_ORIGINS=http://localhost,http://myapp.com → plusieurs origines (séparées par des virgules)
-    cors_origins: str = Field(
-        default="*",
+    #
+    # La chaîne est découpée UNE FOIS, à la création de Settings, par le
+    # validateur _split_cors_origins ci-dessous : le champ contient directement
+    # un tuple d'origines, lu tel quel par le middleware CORS.
+    #
+    # NoDecode : pour un champ de type complexe (tuple, list...), pydantic-settings
+    # essaie par défaut de décoder la variable d'environnement comme du JSON.
+    # NoDecode désactive ce décodage et transmet la chaîne brute au validateur.
+    # Doc : https://docs.pydantic.dev/latest/concepts/pydantic_settings/#parsing-environment-variable-values
+    cors_origins: Annotated[tuple[str, ...], NoDecode] = Field(
+        default=("*",),
         description="Origines CORS autorisées (séparées par des virgules, ou '*' pour tout autoriser)",
     )
 
-    @property
-    def cors_origins_list(self) -> list[str]:
+    # -------------------------------------------------------------------------
+    # Concept Pydantic : @field_validator(mode="before")
+    #
+    #   Un validateur "before" reçoit la valeur brute (ici la chaîne lue dans
+    #   l'environnement) AVANT la validation de type. Il peut la transformer
+    #   pour qu'elle corresponde au type déclaré du champ (ici tuple[str, ...]).
+    #
+    #   Doc : https://docs.pydantic.dev/latest/concepts/validators/#field-before-validator
+    # -------------------------------------------------------------------------
+    @field_validator("cors_origins", mode="before")
+    @classmethod
+    def _split_cors_origins(cls, value: object) -> object:
         """
-        Transforme la chaîne CORS_ORIGINS en liste Python.
+        Transforme la chaîne CORS_ORIGINS en tuple d'origines.
 
         Exemples :
-          "*"                                  → ["*"]
-          "http://localhost,http://myapp.com"  → ["http://localhost", "http://myapp.com"]
+          "*"                                  → ("*",)
+          "http://localhost,http://myapp.com"  → ("http://localhost", "http://myapp.com")
         """
-        return [origin.strip() for origin in self.cors_origins.split(",")]
+        if isinstance(value, str):
+            return tuple(origin.strip() for origin in value.split(","))
+        return value
 
     # -------------------------------------------------------------------------
     # Configuration pydantic-settings
@@ -101,21 +137,41 @@ class Settings(BaseSettings):
     # env_file : chemin du fichier .env (relatif au répertoire de travail)
     # env_file_encoding : encodage du fichier .env
     # case_sensitive : False → PORT et port sont équivalents
+    # frozen : True → instance immuable (settings.port = 9000 lève une erreur).
+    #          get_settings() partage une seule instance dans toute l'application :
+    #          une modification après coup serait visible partout, sans que le
+    #          middleware CORS (déjà configuré) n'en tienne compte. Pour une autre
+    #          configuration, créer une nouvelle instance : Settings(port=9000).
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=False,
+        frozen=True,
     )
 
 
 # =============================================================================
-# Instance globale de la configuration.
+# Instance globale de la configuration — singleton paresseux.
+#
+# Concept FastAPI : @lru_cache sur une fonction get_settings()
+#   Plutôt que d'instancier Settings() à l'import du module (ce qui lit
+#   l'environnement et le fichier .env même si la config n'est jamais utilisée),
+#   on expose une fonction décorée par @lru_cache. Le premier appel crée
+#   l'instance, les suivants retournent le même objet depuis le cache.
 #
-# On crée une seule instance de Settings au démarrage du module.
-# Elle est importée partout dans l'application :
-#   from app.config import settings
+#   get_settings() peut aussi être injectée dans un endpoint :
+#       def mon_endpoint(settings: Settings = Depends(get_settings)): ...
 #
-# pydantic-settings lit les variables d'environnement UNE FOIS à l'instanciation.
-# Les modifications d'environnement après le démarrage ne sont pas prises en compte.
+#   Doc : https://fastapi.tiangolo.com/advanced/settings/#creating-the-settings-only-once-with-lru_cache
+#
+# pydantic-settings lit les variables d'environnement UNE FOIS, au premier appel.
+# Les modifications d'environnement ultérieures ne sont pas prises en compte.
 # =============================================================================
-settings = Settings()
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Retourne l'instance unique de Settings, créée au premier appel.
+    """
+    return Settings()
@@ -7,6 +7,13 @@
 # Chaque dictionnaire mappe un code (clé) vers un libellé (valeur).
 # Les codes sont issus de la spec §6.3.
 #
+# Les tables sont exposées en lecture seule via types.MappingProxyType :
+# une vue sur le dict, sans copie, qui refuse toute modification
+# (GHM["X"] = ... lève TypeError). Les modules consommateurs peuvent donc
+# mémoriser des données dérivées (tuples de codes, etc.) sans craindre
+# qu'une table change en cours d'exécution.
+# Doc : https://docs.python.org/3/library/types.html#types.MappingProxyType
+#
 # Organisation :
 #   1. Nomenclatures cliniques  : GHM, racine, CMD, CIM-10, CCAM
 #   2. Nomenclatures géo etab   : FINESS, secteur, catégorie
@@ -19,13 +26,17 @@
 #   9. COMPOUND_VAR_NAMES       : noms de vars composées (parsing du paramètre var)
 # =============================================================================
 
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any
+
 # =============================================================================
 # 1. NOMENCLATURES CLINIQUES
 # =============================================================================
 
 # GHM — Groupes Homogènes de Malades (6 caractères)
 # Format : CCCNNL (CMD + numéro + niveau de sévérité ou Z pour les actes)
-GHM: dict[str, str] = {
+GHM: Mapping[str, str] = MappingProxyType({
     "05M09T": "Affections de l'appareil circulatoire, sévérité 4",
     "05K06T": "Coronarographies, sévérité 4",
     "01M10T": "Affections du système nerveux, sévérité 4",
@@ -34,10 +45,10 @@ GHM: dict[str, str] = {
     "14Z08Z": "Séances de chimiothérapie pour tumeur",
     "11M05T": "Affections du rein et des voies urinaires, sévérité 4",
     "23Z02Z": "Autres séjours de moins de 2 jours",
-}
+})
 
 # Racine de GHM (5 caractères = CMD + numéro sans niveau)
-RACINE_GHM: dict[str, str] = {
+RACINE_GHM: Mapping[str, str] = MappingProxyType({
     "05M09": "Affections de l'appareil circulatoire",
     "05K06": "Coronarographies",
     "01M10": "Affections du système nerveux - sévérité 4",
@@ -45,10 +56,10 @@ RACINE_GHM: dict[str, str] = {
     "08M04": "Affections musculosquelettiques - sévérité 4",
     "14Z08": "Chimiothérapie pour tumeur",
     "11M05": "Affections du rein et des voies urinaires",
-}
+})
 
 # CMD — Catégories Majeures de Diagnostic (2 chiffres)
-CMD: dict[str, str] = {
+CMD: Mapping[str, str] = MappingProxyType({
     "01": "Affections du système nerveux",
     "05": "Affections de l'appareil circulatoire",
     "06": "Affections du tube digestif",
@@ -56,11 +67,11 @@ CMD: dict[str, str] = {
     "11": "Affections du rein et des voies urinaires",
     "14": "Grossesses pathologiques, accouchements et affections du post-partum",
     "23": "Autres facteurs influant sur l'état de santé",
-}
+})
 
 # CIM-10 — Classification Internationale des Maladies (codes DP/DR/DAS)
 # Codes exemples issus de la spec §6.3 + codes fréquents en MCO
-CIM10: dict[str, str] = {
+CIM10: Mapping[str, str] = MappingProxyType({
     # Codes de la spec §6.3
     "C34": "Tumeur maligne des bronches et du poumon",
     "I50": "Insuffisance cardiaque",
@@ -75,11 +86,11 @@ CIM10: dict[str, str] = {
     "E78": "Troubles du métabolisme des lipoprotéines",
     "F10": "Troubles mentaux et du comportement liés à l'utilisation d'alcool",
     "K57": "Maladie diverticulaire de l'intestin",
-}
+})
 
 # CCAM — Classification Commune des Actes Médicaux (7 caractères)
 # Format : AAAANNNN (4 lettres + 3 chiffres)
-CCAM: dict[str, str] = {
+CCAM: Mapping[str, str] = MappingProxyType({
     "DZQM006": "Enregistrement du signal électrique de coeur",
     "YYYY600": "Acte fictif de test PMSI",
     "EQQP004": "Arthroplastie totale de hanche",
@@ -87,7 +98,7 @@ CCAM: dict[str, str] = {
     "ZCQM002": "Tomographie par émission de positons du corps entier",
     "ABLB001": "Hémicolectomie droite par coelioscopie",
     "BFGA004": "Coronarographie",
-}
+})
 
 # =============================================================================
 # 2. NOMENCLATURES ÉTABLISSEMENTS
@@ -95,7 +106,7 @@ CCAM: dict[str, str] = {
 
 # FINESS PMSI — codes à 9 chiffres des établissements
 # Exemples issus de la spec §6.3
-FINESS: dict[str, str] = {
+FINESS: Mapping[str, str] = MappingProxyType({
     "130783293": "AP-HM HOPITAL DE LA TIMONE",
     "750100018": "AP-HP HOPITAL HOTEL-DIEU",
     "690023154": "HCL HOPITAL EDOUARD HERRIOT",
@@ -103,28 +114,28 @@ FINESS: dict[str, str] = {
     "310781406": "CHU DE TOULOUSE",
     "440000289": "CLINIQUE JULES VERNE",
     "060780491": "CLINIQUE SAINT-GEORGE",
-}
+})
 
 # Catégories d'établissements
-CATEG_ETAB: dict[str, str] = {
+CATEG_ETAB: Mapping[str, str] = MappingProxyType({
     "CH": "Centre hospitalier",
     "CHU": "Centre hospitalo-universitaire",
     "CL": "Clinique privée",
-}
+})
 
 # Secteurs de financement
-SECTEUR: dict[str, str] = {
+SECTEUR: Mapping[str, str] = MappingProxyType({
     "PU": "Public",
     "PR": "Privé",
     "ESPIC": "Établissement de santé privé d'intérêt collectif",
-}
+})
 
 # =============================================================================
 # 3. NOMENCLATURES GÉOGRAPHIQUES
 # =============================================================================
 
 # Départements français — code INSEE (2 à 3 caractères)
-DEPARTEMENTS: dict[str, str] = {
+DEPARTEMENTS: Mapping[str, str] = MappingProxyType({
     "75": "Paris",
     "13": "Bouches-du-Rhône",
     "69": "Rhône",
@@ -135,10 +146,10 @@ DEPARTEMENTS: dict[str, str] = {
     "06": "Alpes-Maritimes",
     "34": "Hérault",
     "44": "Loire-Atlantique",
-}
+})
 
 # Régions françaises — code INSEE à 2 chiffres (post-réforme 2016)
-REGIONS: dict[str, str] = {
+REGIONS: Mapping[str, str] = MappingProxyType({
     "11": "Île-de-France",
     "93": "Provence-Alpes-Côte d'Azur",
     "84": "Auvergne-Rhône-Alpes",
@@ -147,217 +158,245 @@ REGIONS: dict[str, str] = {
     "76": "Occitanie",
     "52": "Pays de la Loire",
     "44": "Grand Est",
-}
+})
 
 # Codes géographiques (communes/IRIS pour domicile patient)
-CODEGEO: list[str] = ["75001", "13001", "69001", "33001", "59001", "31001"]
+CODEGEO: tuple[str, ...] = ("75001", "13001", "69001", "33001", "59001", "31001")
 
 # Codes de zones ARS et territoires de santé (simplifiés pour le mock)
-ZONES_ARS: list[str] = ["ZON01", "ZON02", "ZON03", "ZON04"]
-TERRITOIRES_SANTE: list[str] = ["TS01", "TS02", "TS03", "TS04", "TS05"]
+ZONES_ARS: tuple[str, ...] = ("ZON01", "ZON02", "ZON03", "ZON04")
+TERRITOIRES_SANTE: tuple[str, ...] = ("TS01", "TS02", "TS03", "TS04", "TS05")
 
 # =============================================================================
 # 4. NOMENCLATURE UNITÉS MÉDICALES
 # =============================================================================
 
 # Type d'UM — code à 2 chiffres (nomenclature RUM)
-TYPE_UM: dict[str, str] = {
+TYPE_UM: Mapping[str, str] = MappingProxyType({
     "01": "Médecine",
     "02": "Chirurgie",
     "03": "Obstétrique",
     "04": "Réanimation",
     "13": "Soins intensifs",
     "18": "Ambulatoire et chirurgie ambulatoire",
-}
+})
 
 # =============================================================================
 # 5. NOMENCLATURE MÉDICAMENTS (UCD + hiérarchie ATC)
 # =============================================================================
 
 # UCD — Unités Communes de Dispensation (codes à 7 chiffres)
-UCD: dict[str, str] = {
+UCD: Mapping[str, str] = MappingProxyType({
     "9360937": "BEVACIZUMAB 100MG/4ML",
     "9261337": "RITUXIMAB 500MG/50ML",
     "9340017": "TRASTUZUMAB 150MG",
     "9240487": "CETUXIMAB 5MG/ML SOLUTION INJECTABLE",
     "9286507": "NIVOLUMAB 10MG/ML SOLUTION INJECTABLE",
-}
+})
 
 # Hiérarchie ATC (Anatomical Therapeutic Chemical classification) par UCD
 # L'ATC classe les médicaments en 5 niveaux anatomiques/pharmacologiques.
 # Ici, tous sont dans la classe L (antinéoplasiques) — fréquents en MCO T2A.
-ATC_DATA: dict[str, dict[str, str]] = {
-    "9360937": {  # Bevacizumab — anticorps monoclonal anti-VEGF
+ATC_DATA: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    "9360937": MappingProxyType({  # Bevacizumab — anticorps monoclonal anti-VEGF
         "atc1": "L",
         "atc2": "L01",
         "atc3": "L01F",
         "atc4": "L01FG",
         "atc5": "L01FG01",
-    },
-    "9261337": {  # Rituximab — anticorps monoclonal anti-CD20
+    }),
+    "9261337": MappingProxyType({  # Rituximab — anticorps monoclonal anti-CD20
         "atc1": "L",
         "atc2": "L01",
         "atc3": "L01F",
         "atc4": "L01FA",
         "atc5": "L01FA01",
-    },
-    "9340017": {  # Trastuzumab — anticorps anti-HER2
+    }),
+    "9340017": MappingProxyType({  # Trastuzumab — anticorps anti-HER2
         "atc1": "L",
         "atc2": "L01",
         "atc3": "L01F",
         "atc4": "L01FD",
         "atc5": "L01FD01",
-    },
-    "9240487": {  # Cetuximab — anticorps anti-EGFR
+    }),
+    "9240487": MappingProxyType({  # Cetuximab — anticorps anti-EGFR
         "atc1": "L",
         "atc2": "L01",
         "atc3": "L01F",
         "atc4": "L01FE",
         "atc5": "L01FE01",
-    },
-    "9286507": {  # Nivolumab — inhibiteur de point de contrôle immunitaire
+    }),
+    "9286507": MappingProxyType({  # Nivolumab — inhibiteur de point de contrôle immunitaire
         "atc1": "L",
         "atc2": "L01",
         "atc3": "L01F",
         "atc4": "L01FF",
         "atc5": "L01FF01",
-    },
-}
+    }),
+})
 
 # =============================================================================
 # 6. NOMENCLATURE DMI / LPP (Dispositifs Médicaux Implantables)
 # =============================================================================
 
 # LPP — Liste des Produits et Prestations (codes à 7 chiffres)
-LPP: dict[str, str] = {
+LPP: Mapping[str, str] = MappingProxyType({
     "3415677": "PROTHESE TOTALE DE HANCHE",
     "3157742": "STIMULATEUR CARDIAQUE DOUBLE CHAMBRE",
     "3401024": "PROTHESE TOTALE DE GENOU",
     "3401036": "BIOPROTHESE VALVULAIRE AORTIQUE",
-}
+})
 
 # Hiérarchie LPP — niveaux de classification des DMI
-HIERA_LPP: dict[str, str] = {
+HIERA_LPP: Mapping[str, str] = MappingProxyType({
     "04": "IMPLANTS ARTICULAIRES",
     "06": "IMPLANTS CARDIO-VASCULAIRES",
     "07": "NEUROCHIRURGIE ET NEUROLOGIE",
     "08": "OPHTALMOLOGIE",
-}
+})
 
 # =============================================================================
 # 7. NOMENCLATURES PARCOURS (modes d'entrée / sortie)
 # =============================================================================
 
 # Modes d'entrée (1er chiffre du couple modentprov)
-MODE_ENTREE: dict[str, str] = {
+MODE_ENTREE: Mapping[str, str] = MappingProxyType({
     "6": "Mutation (depuis un autre service du même établissement)",
     "7": "Transfert (depuis un autre établissement)",
     "8": "Domicile (entrée directe)",
-}
+})
 
 # Modes de sortie (1er chiffre du couple modsordest)
-MODE_SORTIE: dict[str, str] = {
+MODE_SORTIE: Mapping[str, str] = MappingProxyType({
     "6": "Mutation (vers un autre service du même établissement)",
     "7": "Transfert (vers un autre établissement)",
     "8": "Retour à domicile",
     "9": "Décès",
-}
+})
 
 # Provenance (2e chiffre du couple mode_entrée_provenance)
-PROVENANCE: dict[str, str] = {
+PROVENANCE: Mapping[str, str] = MappingProxyType({
     "1": "Domicile",
     "2": "MCO",
     "3": "SSR",
     "4": "Psychiatrie",
     "5": "HAD",
     "6": "EHPAD",
-}
+})
 
 # Destination (2e chiffre du couple mode_sortie_destination)
-DESTINATION: dict[str, str] = {
+DESTINATION: Mapping[str, str] = MappingProxyType({
     "1": "Domicile",
     "2": "MCO",
     "3": "SSR",
     "4": "Psychiatrie",
     "5": "HAD",
     "6": "EHPAD",
-}
+})
 
 # Types d'hospitalisation
-TYPHOSP: dict[str, str] = {
+TYPHOSP: Mapping[str, str] = MappingProxyType({
     "M": "Médecine",
     "C": "Chirurgie",
     "O": "Obstétrique",
-}
+})
 
 # Sexe du patient
-SEXE: dict[str, str] = {
+SEXE: Mapping[str, str] = MappingProxyType({
     "1": "Homme",
     "2": "Femme",
-}
+})
 
 # =============================================================================
 # 8. VAR_VALUES — valeurs disponibles pour chaque variable de ventilation
 #
 # Utilisé par le générateur mock pour produire les lignes de réponse.
 # Chaque entrée associe un nom de var (tel qu'attendu dans le paramètre `var`)
-# à la liste des valeurs que peut prendre cette dimension.
+# au tuple des valeurs que peut prendre cette dimension. Les tuples sont
+# immuables : ces données de référence peuvent être partagées (et mémorisées
+# par lru_cache côté générateur) sans copie défensive.
 #
 # Note : les vars composés (sexe_trancheage, modentprov_modsordest) ne sont
 # pas listés ici — ils sont gérés dynamiquement dans mock_data.py.
 # =============================================================================
 
-VAR_VALUES: dict[str, list] = {
+# Tuples de codes partagés : une seule séquence par nomenclature, référencée
+# par toutes les vars qui en dépendent (ex : finess et finessgeo, regetab et
+# regpat). tuple(DICT) donne les clés dans l'ordre d'insertion, comme
+# list(DICT.keys()), mais produit une séquence immuable : aucun appelant ne
+# peut la modifier par accident.
+_SEXE_KEYS: tuple[str, ...] = tuple(SEXE)
+_TYPHOSP_KEYS: tuple[str, ...] = tuple(TYPHOSP)
+_GHM_KEYS: tuple[str, ...] = tuple(GHM)
+_RACINE_KEYS: tuple[str, ...] = tuple(RACINE_GHM)
+_CMD_KEYS: tuple[str, ...] = tuple(CMD)
+_CIM10_KEYS: tuple[str, ...] = tuple(CIM10)
+_FINESS_KEYS: tuple[str, ...] = tuple(FINESS)
+_CATEG_KEYS: tuple[str, ...] = tuple(CATEG_ETAB)
+_SECTEUR_KEYS: tuple[str, ...] = tuple(SECTEUR)
+_REGION_KEYS: tuple[str, ...] = tuple(REGIONS)
+_DEP_KEYS: tuple[str, ...] = tuple(DEPARTEMENTS)
+_MODE_ENTREE_KEYS: tuple[str, ...] = tuple(MODE_ENTREE)
+_MODE_SORTIE_KEYS: tuple[str, ...] = tuple(MODE_SORTIE)
+_PROVENANCE_KEYS: tuple[str, ...] = tuple(PROVENANCE)
+_DESTINATION_KEYS: tuple[str, ...] = tuple(DESTINATION)
+
+# Dimensions temporelles : mois de sortie (1 à 12) et durée de séjour en jours
+# (0 à 15). Construits une seule fois, à l'import du module.
+_MOIS: tuple[int, ...] = tuple(range(1, 13))
+_DUREE: tuple[int, ...] = tuple(range(16))
+
+VAR_VALUES: Mapping[str, tuple[Any, ...]] = MappingProxyType({
     # --- Démographie ---
-    "sexe": list(SEXE.keys()),                    # ["1", "2"]
-    "typhosp": list(TYPHOSP.keys()),              # ["M", "C", "O"]
-    "passageurg": ["0", "1"],
+    "sexe": _SEXE_KEYS,                           # ("1", "2")
+    "typhosp": _TYPHOSP_KEYS,                     # ("M", "C", "O")
+    "passageurg": ("0", "1"),
 
     # --- Temporel ---
-    "mois": list(range(1, 13)),                   # [1, 2, ..., 12]
-    "duree": list(range(0, 16)),                  # [0, 1, ..., 15]
+    "mois": _MOIS,                                # (1, 2, ..., 12)
+    "duree": _DUREE,                              # (0, 1, ..., 15)
 
     # --- Classification clinique ---
-    "ghm": list(GHM.keys()),
-    "racine": list(RACINE_GHM.keys()),
-    "cmd": list(CMD.keys()),
-    "dp": list(CIM10.keys()),
-    "dr": list(CIM10.keys()),
+    "ghm": _GHM_KEYS,
+    "racine": _RACINE_KEYS,
+    "cmd": _CMD_KEYS,
+    "dp": _CIM10_KEYS,
+    "dr": _CIM10_KEYS,
 
     # Sous-classifications GHM (codes simplifiés pour le mock)
-    "da": ["01", "02", "03", "04", "05"],
-    "ga": ["GA01", "GA02", "GA03", "GA04"],
-    "gp": ["GP01", "GP02", "GP03"],
-    "aso": ["ASO1", "ASO2", "ASO3"],
-    "cas": ["CAS1", "CAS2", "CAS3"],
+    "da": ("01", "02", "03", "04", "05"),
+    "ga": ("GA01", "GA02", "GA03", "GA04"),
+    "gp": ("GP01", "GP02", "GP03"),
+    "aso": ("ASO1", "ASO2", "ASO3"),
+    "cas": ("CAS1", "CAS2", "CAS3"),
 
     # --- Établissement ---
-    "finess": list(FINESS.keys()),
-    "finessgeo": list(FINESS.keys()),             # même codes pour le mock
-    "categ": list(CATEG_ETAB.keys()),
-    "secteur": list(SECTEUR.keys()),
+    "finess": _FINESS_KEYS,
+    "finessgeo": _FINESS_KEYS,                    # même codes pour le mock
+    "categ": _CATEG_KEYS,
+    "secteur": _SECTEUR_KEYS,
 
     # --- Géographie établissement ---
-    "regetab": list(REGIONS.keys()),
-    "depetab": list(DEPARTEMENTS.keys()),
+    "regetab": _REGION_KEYS,
+    "depetab": _DEP_KEYS,
     "tsetab": TERRITOIRES_SANTE,
     "zonetab": ZONES_ARS,
 
     # --- Géographie patient ---
-    "regpat": list(REGIONS.keys()),
-    "deppat": list(DEPARTEMENTS.keys()),
+    "regpat": _REGION_KEYS,
+    "deppat": _DEP_KEYS,
     "tspat": TERRITOIRES_SANTE,
     "codegeo": CODEGEO,
     "zonpat": ZONES_ARS,
 
     # --- Parcours (pour les vars simples) ---
-    "modentprov": ["8_1", "8_5", "6_1", "7_1"],   # couple modentree_provenance
-    "modsordest": ["8_4", "6_1", "7_3", "9_9"],   # couple modsortie_destination
-    "modeeentree": list(MODE_ENTREE.keys()),
-    "modesortie": list(MODE_SORTIE.keys()),
-    "provenance": list(PROVENANCE.keys()),
-    "destination": list(DESTINATION.keys()),
-}
+    "modentprov": ("8_1", "8_5", "6_1", "7_1"),   # couple modentree_provenance
+    "modsordest": ("8_4", "6_1", "7_3", "9_9"),   # couple modsortie_destination
+    "modeeentree": _MODE_ENTREE_KEYS,
+    "modesortie": _MODE_SORTIE_KEYS,
+    "provenance": _PROVENANCE_KEYS,
+    "destination": _DESTINATION_KEYS,
+})
 
 # =============================================================================
 # 9. COMPOUND_VAR_NAMES — noms de variables composées
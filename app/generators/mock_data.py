@@ -10,6 +10,11 @@
 #      On instancie random.Random(seed) au lieu d'utiliser random.randint()
 #      directement, pour que chaque appel puisse avoir son propre seed
 #      sans affecter le générateur global de Python.
+#      Sans seed, toutes les requêtes partagent une même instance créée au
+#      chargement du module (_DEFAULT_RNG) : inutile d'initialiser un nouvel
+#      état Mersenne Twister (~2,5 Ko) à chaque appel. Cette instance est
+#      réinitialisée avec RANDOM_SEED (settings.random_seed) par warmup(), au
+#      démarrage de l'application : l'import du module ne lit pas la config.
 #      Doc : https://docs.python.org/3/library/random.html#random.Random
 #
 #   2. itertools.product
@@ -19,7 +24,21 @@
 #      Utilisé pour générer toutes les combinaisons de valeurs de var.
 #      Doc : https://docs.python.org/3/library/itertools.html#itertools.product
 #
-#   3. typing.Any
+#   3. re.compile / Pattern.findall
+#      Une expression régulière compilée une fois au chargement du module
+#      découpe le paramètre var en une seule passe (moteur regex écrit en C).
+#      Doc : https://docs.python.org/3/library/re.html
+#
+#   4. functools.lru_cache
+#      Mémorise le résultat d'une fonction pure pour chaque combinaison
+#      d'arguments déjà vue. Les utilitaires de parsing ci-dessous ne reçoivent
+#      qu'une poignée de valeurs distinctes d'une requête à l'autre : après le
+#      premier appel, le résultat est une simple lecture dans un dict.
+#      Les résultats mémorisés sont des tuples (immuables) : un appelant ne
+#      peut pas modifier par erreur la valeur partagée par le cache.
+#      Doc : https://docs.python.org/3/library/functools.html#functools.lru_cache
+#
+#   5. typing.Any
 #      Utilisé dans les annotations de type quand la valeur peut être
 #      de n'importe quel type (int, str, float, tuple...).
 #
@@ -29,19 +48,35 @@
 #   parse_var()              → liste de tokens depuis la chaîne var
 #   get_var_values()         → valeurs disponibles pour un token de var
 #   _get_var_columns()       → noms de colonnes produits par un token de var
+#   warmup()                 → pré-remplissage des caches au démarrage de l'app
+#   _expand_var_columns()    → colonnes du produit cartésien des valeurs de var
+#   _sample_var_columns()    → idem, plafonné à _MAX_ROWS combinaisons tirées au hasard
+#   _rows_from_columns()     → transposition colonnes → liste de lignes
+#   generate_base_columns()  → les 5 statistiques de base pour n lignes (par colonne)
 #   generate_base_row()      → dict avec les 5 statistiques de base
+#   _build_var_rows()        → tronc commun des endpoints ventilés par var
 #   generate_resume_rows()   → liste de lignes pour GET /resume
 #
 # Seed et déterminisme :
 #   Toutes les fonctions acceptent un paramètre seed optionnel.
-#   seed=None → résultats aléatoires à chaque appel (comportement par défaut)
+#   seed=None → générateur partagé _DEFAULT_RNG (comportement par défaut) :
+#               aléatoire, ou, si la variable d'environnement RANDOM_SEED est
+#               fixée, reproductible d'un démarrage à l'autre pour des requêtes
+#               successives (les endpoints tournent dans le pool de threads de
+#               Starlette : des requêtes simultanées se partagent les tirages
+#               dans un ordre imprévisible)
 #   seed=42   → résultats toujours identiques (utile pour les tests)
 # =============================================================================
 
+import math
 import random
+import re
+from collections.abc import Callable, Sequence
+from functools import lru_cache
 from itertools import product
 from typing import Any
 
+from app.config import get_settings
 from app.data.nomenclatures import (
     ATC_DATA,
     CCAM,
@@ -66,7 +101,25 @@ from app.data.nomenclatures import (
 # =============================================================================
 
 
-def parse_trancheage(trancheage_param: str | None) -> list[str]:
+# Labels de la pyramide des âges standard MCO (bornes 10_20_..._90).
+# C'est le cas de loin le plus fréquent (paramètre trancheage absent) :
+# parse_trancheage() retourne directement cette constante.
+_DEFAULT_TRANCHEAGE_LABELS: tuple[str, ...] = (
+    "[0-10 ans]",
+    "[11-20 ans]",
+    "[21-30 ans]",
+    "[31-40 ans]",
+    "[41-50 ans]",
+    "[51-60 ans]",
+    "[61-70 ans]",
+    "[71-80 ans]",
+    "[81-90 ans]",
+    "[91 ans et +]",
+)
+
+
+@lru_cache(maxsize=256)
+def parse_trancheage(trancheage_param: str | None) -> tuple[str, ...]:
     """
     Génère les labels de tranches d'âge à partir du paramètre trancheage.
 
@@ -81,33 +134,51 @@ def parse_trancheage(trancheage_param: str | None) -> list[str]:
                           ex : '10_20_30'. Si None, utilise les bornes standard.
 
     Returns:
-        Liste de labels de tranches d'âge.
+        Tuple de labels de tranches d'âge (mémorisé par lru_cache).
 
     Exemples :
-        parse_trancheage("10_20_30") → ["[0-10 ans]", "[11-20 ans]",
-                                         "[21-30 ans]", "[31 ans et +]"]
-        parse_trancheage(None)       → 10 tranches avec bornes standard
+        parse_trancheage("10_20_30") → ("[0-10 ans]", "[11-20 ans]",
+                                         "[21-30 ans]", "[31 ans et +]")
+        parse_trancheage(None)       → _DEFAULT_TRANCHEAGE_LABELS (10 tranches)
     """
     if not trancheage_param:
-        # Bornes par défaut correspondant à la pyramide des âges standard MCO
-        bornes = [10, 20, 30, 40, 50, 60, 70, 80, 90]
-    else:
-        bornes = [int(b) for b in trancheage_param.split("_")]
-
-    labels = []
-    prev = 0
-    for borne in bornes:
-        if prev == 0:
-            labels.append(f"[0-{borne} ans]")
-        else:
-            labels.append(f"[{prev + 1}-{borne} ans]")
-        prev = borne
-    # Dernière tranche : au-delà de la dernière borne
-    labels.append(f"[{prev + 1} ans et +]")
-    return labels
+        # Bornes par défaut : labels précalculés, aucun formatage nécessaire
+        return _DEFAULT_TRANCHEAGE_LABELS
+
+    bornes = tuple(map(int, trancheage_param.split("_")))
+
+    # Première tranche depuis 0, puis une tranche par intervalle entre deux
+    # bornes consécutives (zip(bornes, bornes[1:]) → (10, 20), (20, 30), ...),
+    # et enfin la tranche au-delà de la dernière borne.
+    return (
+        f"[0-{bornes[0]} ans]",
+        *(f"[{prev + 1}-{borne} ans]" for prev, borne in zip(bornes, bornes[1:])),
+        f"[{bornes[-1] + 1} ans et +]",
+    )
 
 
-def parse_var(var_string: str | None) -> list[str]:
+# Expression régulière de découpage du paramètre var, compilée une seule fois
+# à l'import du module.
+#
+#   - Alternatives 1..n : les noms composés, du plus long au plus court, pour
+#     qu'un nom composé l'emporte sur un préfixe plus court. Le lookahead
+#     (?=_|$) impose que le nom composé soit suivi d'un '_' ou de la fin de
+#     chaîne (ex : 'sexe_trancheagex' n'est PAS le nom composé).
+#   - Dernière alternative : un token simple = tout jusqu'au prochain '_'.
+#
+# Doc : https://docs.python.org/3/library/re.html#re.Pattern.findall
+_VAR_TOKEN_RE = re.compile(
+    "(?:"
+    + "|".join(
+        re.escape(compound)
+        for compound in sorted(COMPOUND_VAR_NAMES, key=len, reverse=True)
+    )
+    + r")(?=_|$)|[^_]+"
+)
+
+
+@lru_cache(maxsize=256)
+def parse_var(var_string: str | None) -> tuple[str, ...]:
     """
     Parse la chaîne var en liste ordonnée de tokens de ventilation.
 
@@ -118,57 +189,31 @@ def parse_var(var_string: str | None) -> list[str]:
 
     L'algorithme est "greedy" : il essaie de faire correspondre les noms
     composés en priorité (par ordre de longueur décroissante), puis les
-    noms simples.
+    noms simples. Il est entièrement porté par l'expression régulière
+    précompilée _VAR_TOKEN_RE (voir ci-dessus). Les segments vides
+    (ex : '__') sont ignorés.
 
     Args:
         var_string: chaîne de variables, ex : 'ghm', 'sexe_trancheage_ghm'.
                     None ou chaîne vide retourne une liste vide.
 
     Returns:
-        Liste de tokens de var, dans l'ordre d'apparition.
+        Tuple de tokens de var, dans l'ordre d'apparition (mémorisé par lru_cache).
 
     Exemples :
-        parse_var(None)                    → []
-        parse_var("ghm")                   → ["ghm"]
-        parse_var("ghm_mois")              → ["ghm", "mois"]
-        parse_var("sexe_trancheage")       → ["sexe_trancheage"]
-        parse_var("sexe_trancheage_ghm")   → ["sexe_trancheage", "ghm"]
-        parse_var("modentprov_modsordest") → ["modentprov_modsordest"]
+        parse_var(None)                    → ()
+        parse_var("ghm")                   → ("ghm",)
+        parse_var("ghm_mois")              → ("ghm", "mois")
+        parse_var("sexe_trancheage")       → ("sexe_trancheage",)
+        parse_var("sexe_trancheage_ghm")   → ("sexe_trancheage", "ghm")
+        parse_var("modentprov_modsordest") → ("modentprov_modsordest",)
     """
     if not var_string:
-        return []
-
-    tokens: list[str] = []
-    remaining = var_string
-
-    # Trier les vars composés par longueur décroissante pour éviter les
-    # faux-positifs : on essaie d'abord le plus long nom composé.
-    compound_sorted = sorted(COMPOUND_VAR_NAMES, key=len, reverse=True)
-
-    while remaining:
-        matched = False
+        return ()
 
-        # Essayer chaque var composé en premier
-        for compound in compound_sorted:
-            # Le var composé correspond si :
-            #   - il est exactement égal à `remaining` (dernier token)
-            #   - OU il est suivi d'un '_' (d'autres tokens suivent)
-            if remaining == compound or remaining.startswith(compound + "_"):
-                tokens.append(compound)
-                remaining = remaining[len(compound):]
-                # Consommer le '_' séparateur s'il reste du texte
-                if remaining.startswith("_"):
-                    remaining = remaining[1:]
-                matched = True
-                break
-
-        if not matched:
-            # Pas de var composé trouvé : prendre le token jusqu'au prochain '_'
-            parts = remaining.split("_", 1)
-            tokens.append(parts[0])
-            remaining = parts[1] if len(parts) > 1 else ""
-
-    return tokens
+    # findall() parcourt la chaîne en une seule passe dans le moteur regex (C)
+    # et retourne la liste des correspondances, dans l'ordre.
+    return tuple(_VAR_TOKEN_RE.findall(var_string))
 
 
 # =============================================================================
@@ -176,15 +221,34 @@ def parse_var(var_string: str | None) -> list[str]:
 # =============================================================================
 
 
+# Produit cartésien modentprov × modsordest. Contrairement à sexe_trancheage
+# (qui dépend du paramètre trancheage), ses deux composantes sont fixes : on
+# le calcule une seule fois, au chargement du module.
+_MODENTPROV_X_MODSORDEST: tuple[tuple[str, str], ...] = tuple(
+    product(VAR_VALUES["modentprov"], VAR_VALUES["modsordest"])
+)
+
+# Table des valeurs de chaque token connu pour la pyramide des âges standard
+# (paramètre trancheage absent), construite une fois à l'import. C'est le cas
+# le plus courant : get_var_values() se résume alors à une lecture de dict.
+_DEFAULT_VAR_VALUES: dict[str, tuple[Any, ...]] = {
+    **VAR_VALUES,
+    "sexe_trancheage": tuple(product(VAR_VALUES["sexe"], _DEFAULT_TRANCHEAGE_LABELS)),
+    "modentprov_modsordest": _MODENTPROV_X_MODSORDEST,
+    "trancheage": _DEFAULT_TRANCHEAGE_LABELS,
+}
+
+
+@lru_cache(maxsize=256)
 def get_var_values(
     var_token: str,
     trancheage_param: str | None = None,
-) -> list[Any]:
+) -> tuple[Any, ...]:
     """
-    Retourne la liste des valeurs possibles pour un token de ventilation.
+    Retourne les valeurs possibles pour un token de ventilation.
 
     Pour les vars composés (sexe_trancheage, modentprov_modsordest),
-    retourne une liste de tuples (produit cartésien des composantes).
+    retourne des tuples (produit cartésien des composantes).
 
     Args:
         var_token: nom du token, ex : 'ghm', 'sexe_trancheage'.
@@ -192,21 +256,24 @@ def get_var_values(
                           (bornes séparées par '_').
 
     Returns:
-        Liste de valeurs scalaires (str, int) pour les vars simples,
-        ou liste de tuples pour les vars composés.
+        Tuple de valeurs scalaires (str, int) pour les vars simples,
+        ou tuple de tuples pour les vars composés (mémorisé par lru_cache).
     """
+    # --- Cas courant : token connu, bornes d'âge standard → table précalculée ---
+    if not trancheage_param and var_token in _DEFAULT_VAR_VALUES:
+        return _DEFAULT_VAR_VALUES[var_token]
+
     # --- Var composé : sexe × trancheage (pyramide des âges) ---
     if var_token == "sexe_trancheage":
         sexe_values = VAR_VALUES["sexe"]
         trancheage_values = parse_trancheage(trancheage_param)
         # product() génère toutes les paires (sexe, tranche_age)
-        return list(product(sexe_values, trancheage_values))
+        return tuple(product(sexe_values, trancheage_values))
 
     # --- Var composé : mode_entrée × mode_sortie (parcours) ---
+    # Les deux composantes sont des constantes : produit précalculé à l'import.
     if var_token == "modentprov_modsordest":
-        modentprov_values = VAR_VALUES["modentprov"]
-        modsordest_values = VAR_VALUES["modsordest"]
-        return list(product(modentprov_values, modsordest_values))
+        return _MODENTPROV_X_MODSORDEST
 
     # --- Var trancheage seul (sans sexe) ---
     if var_token == "trancheage":
@@ -218,10 +285,19 @@ def get_var_values(
 
     # Var inconnu : générer des valeurs génériques pour ne pas bloquer
     # (robustesse face à un paramètre var non répertorié)
-    return [f"{var_token}_val1", f"{var_token}_val2", f"{var_token}_val3"]
+    return (f"{var_token}_val1", f"{var_token}_val2", f"{var_token}_val3")
+
 
+# Colonnes produites par les vars composés. Les vars simples, absents de ce
+# dict, produisent une seule colonne portant le nom du token.
+_VAR_COLUMNS_OVERRIDE: dict[str, tuple[str, ...]] = {
+    "sexe_trancheage": ("sexe", "trancheage"),
+    "modentprov_modsordest": ("modentprov", "modsordest"),
+}
 
-def _get_var_columns(var_token: str) -> list[str]:
+
+@lru_cache(maxsize=256)
+def _get_var_columns(var_token: str) -> tuple[str, ...]:
     """
     Retourne les noms de colonnes qu'ajoute un token de ventilation.
 
@@ -232,19 +308,151 @@ def _get_var_columns(var_token: str) -> list[str]:
         var_token: nom du token de var.
 
     Returns:
-        Liste de noms de colonnes JSON.
+        Tuple de noms de colonnes JSON (mémorisé par lru_cache).
 
     Exemples :
-        _get_var_columns("ghm")                   → ["ghm"]
-        _get_var_columns("sexe_trancheage")        → ["sexe", "trancheage"]
-        _get_var_columns("modentprov_modsordest")  → ["modentprov", "modsordest"]
+        _get_var_columns("ghm")                   → ("ghm",)
+        _get_var_columns("sexe_trancheage")        → ("sexe", "trancheage")
+        _get_var_columns("modentprov_modsordest")  → ("modentprov", "modsordest")
     """
-    if var_token == "sexe_trancheage":
-        return ["sexe", "trancheage"]
-    if var_token == "modentprov_modsordest":
-        return ["modentprov", "modsordest"]
-    # Var simple : une seule colonne, même nom que le token
-    return [var_token]
+    return _VAR_COLUMNS_OVERRIDE.get(var_token, (var_token,))
+
+
+def warmup() -> None:
+    """
+    Pré-remplit les caches lru_cache du module pour les cas par défaut.
+
+    Appelée une fois au démarrage de l'application (lifespan, voir app/main.py) :
+    le premier appel de chaque worker trouve alors les labels de tranches d'âge,
+    les valeurs et les colonnes de chaque token de var déjà mémorisés, au lieu
+    de payer ces calculs pendant la requête.
+
+    Elle initialise aussi le générateur partagé _DEFAULT_RNG avec RANDOM_SEED :
+    la configuration n'est lue qu'ici, pas à l'import du module. Sans seed,
+    random.seed(None) repart de l'entropie du système.
+    """
+    _DEFAULT_RNG.seed(get_settings().random_seed)
+    parse_trancheage(None)
+    for var_token in _DEFAULT_VAR_VALUES:
+        get_var_values(var_token)
+        _get_var_columns(var_token)
+
+
+def _expand_var_columns(
+    all_var_values: Sequence[Sequence[Any]],
+    all_var_columns: Sequence[tuple[str, ...]],
+) -> tuple[int, dict[str, list[Any]]]:
+    """
+    Construit les colonnes du produit cartésien des valeurs de ventilation.
+
+    Équivalent « colonne par colonne » de product(*all_var_values) : au lieu
+    d'énumérer chaque combinaison, on calcule directement la colonne de chaque
+    token. Pour le token i, chaque valeur est répétée autant de fois qu'il y a
+    de combinaisons des tokens suivants (repeat), et le bloc obtenu est
+    recopié autant de fois qu'il y a de combinaisons des tokens précédents
+    (tile). L'ordre des lignes est identique à celui de itertools.product.
+
+    Exemple : valeurs [["M", "C"], [1, 2, 3]], colonnes [("typhosp",), ("mois",)]
+        → 6, {"typhosp": ["M", "M", "M", "C", "C", "C"],
+              "mois":    [1, 2, 3, 1, 2, 3]}
+
+    Les vars composés (valeurs = tuples) sont éclatés en une colonne par
+    composante, ex : ("sexe", "trancheage").
+
+    Args:
+        all_var_values: valeurs possibles de chaque token, dans l'ordre.
+        all_var_columns: colonnes produites par chaque token (_get_var_columns).
+
+    Returns:
+        Tuple (nombre de lignes, dict colonne → liste de valeurs).
+    """
+    sizes = [len(values) for values in all_var_values]
+    n_rows = math.prod(sizes)
+    columns: dict[str, list[Any]] = {}
+
+    for i, (values, token_cols) in enumerate(zip(all_var_values, all_var_columns)):
+        repeat = math.prod(sizes[i + 1:])
+        tile = math.prod(sizes[:i])
+        expanded = [value for value in values for _ in range(repeat)] * tile
+        if len(token_cols) > 1:
+            # Var composé : chaque valeur est un tuple, une composante par colonne
+            for j, col in enumerate(token_cols):
+                columns[col] = [value[j] for value in expanded]
+        else:
+            columns[token_cols[0]] = expanded
+
+    return n_rows, columns
+
+
+# Nombre maximal de lignes renvoyées pour un produit cartésien : au-delà, on
+# tire un échantillon aléatoire de combinaisons (ex : finess × dp × mois =
+# 7 × 12 × 12 = 1008 lignes → trop).
+_MAX_ROWS = 100
+
+
+def _sample_var_columns(
+    rng: random.Random,
+    all_var_values: Sequence[Sequence[Any]],
+    all_var_columns: Sequence[tuple[str, ...]],
+    max_rows: int = _MAX_ROWS,
+) -> tuple[int, dict[str, list[Any]]]:
+    """
+    Comme _expand_var_columns(), mais plafonné à max_rows lignes.
+
+    Si le produit cartésien dépasse max_rows combinaisons, on tire d'abord
+    max_rows indices linéaires distincts (rng.sample), puis on retrouve
+    directement la valeur de chaque token par arithmétique d'indices : avec
+    stride = nombre de combinaisons des tokens suivants, la position du token
+    dans la combinaison n° index vaut (index // stride) % len(valeurs). C'est
+    le même ordre que itertools.product (le dernier token varie le plus vite).
+
+    Le produit complet n'est jamais parcouru ni matérialisé : le coût est en
+    O(max_rows × nombre de tokens), et les statistiques ne sont générées que
+    pour les lignes effectivement renvoyées.
+
+    Args:
+        rng: générateur aléatoire (tirage des combinaisons conservées).
+        all_var_values: valeurs possibles de chaque token, dans l'ordre.
+        all_var_columns: colonnes produites par chaque token (_get_var_columns).
+        max_rows: nombre maximal de lignes.
+
+    Returns:
+        Tuple (nombre de lignes, dict colonne → liste de valeurs).
+    """
+    total = math.prod(len(values) for values in all_var_values)
+    if total <= max_rows:
+        return _expand_var_columns(all_var_values, all_var_columns)
+
+    # Indices triés : les lignes gardent l'ordre de product()
+    indices = sorted(rng.sample(range(total), max_rows))
+
+    columns: dict[str, list[Any]] = {}
+    stride = total
+    for values, token_cols in zip(all_var_values, all_var_columns):
+        size = len(values)
+        stride //= size
+        token_values = [values[index // stride % size] for index in indices]
+        if len(token_cols) > 1:
+            # Var composé : chaque valeur est un tuple, une composante par colonne
+            for j, col in enumerate(token_cols):
+                columns[col] = [value[j] for value in token_values]
+        else:
+            columns[token_cols[0]] = token_values
+
+    return max_rows, columns
+
+
+def _rows_from_columns(columns: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    """
+    Transpose un dict de colonnes en liste de lignes (dicts).
+
+    L'ordre des clés de chaque ligne suit l'ordre des colonnes du dict.
+
+    Exemple : {"ghm": ["05M09T", "05K06T"], "nb_sej": [120, 340]}
+        → [{"ghm": "05M09T", "nb_sej": 120}, {"ghm": "05K06T", "nb_sej": 340}]
+    """
+    keys = tuple(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
 
 
 # =============================================================================
@@ -252,13 +460,39 @@ def _get_var_columns(var_token: str) -> list[str]:
 # =============================================================================
 
 
-def generate_base_row(rng: random.Random) -> dict[str, Any]:
+# Générateur partagé par tous les appels sans seed.
+# random.Random() s'initialise depuis l'entropie du système ; warmup() le
+# réinitialise avec RANDOM_SEED au démarrage de l'application.
+_DEFAULT_RNG = random.Random()
+
+
+def _get_rng(seed: int | None) -> random.Random:
     """
-    Génère les statistiques de base d'une ligne mock MCO.
+    Retourne le générateur aléatoire à utiliser pour un appel.
 
-    Retourne un dictionnaire avec les 5 colonnes statistiques communes
-    à la plupart des endpoints. Les valeurs sont dans des plages réalistes
-    pour des données d'activité hospitalière MCO :
+    seed=None → le générateur partagé _DEFAULT_RNG (RANDOM_SEED, voir warmup()).
+    seed=42   → un nouveau random.Random(42) (résultats reproductibles).
+    """
+    if seed is None:
+        return _DEFAULT_RNG
+    return random.Random(seed)
+
+
+def generate_base_columns(rng: random.Random, n: int) -> dict[str, list[Any]]:
+    """
+    Génère les statistiques de base de n lignes mock MCO, colonne par colonne.
+
+    Plutôt que de tirer les 5 valeurs d'une ligne puis de passer à la suivante,
+    on tire d'un coup les n valeurs de chaque colonne (une compréhension de
+    liste par colonne). rng.randint est lié à une variable locale avant les
+    boucles : Python n'a plus à le résoudre à chaque itération.
+
+    Les valeurs décimales sont tirées sur une grille entière puis divisées
+    (ex : randint(100, 1500) / 100 pour 2 décimales) : un seul tirage et une
+    division, sans round(uniform(...), 2). Le résultat est le même flottant
+    que l'arrondi à 2 décimales.
+
+    Plages de valeurs (réalistes pour l'activité hospitalière MCO) :
 
       - nb_sej          : 100 à 30 000 séjours
       - duree_moy_sej   : 1.0 à 15.0 jours (médiane MCO réelle ≈ 5 jours)
@@ -266,6 +500,32 @@ def generate_base_row(rng: random.Random) -> dict[str, Any]:
       - tx_male         : 0.30 à 0.70 (distribution par sexe)
       - age_moy         : 30.0 à 85.0 ans (population MCO adulte surtout)
 
+    Args:
+        rng: instance de random.Random, permet le contrôle du seed.
+        n: nombre de lignes à générer.
+
+    Returns:
+        Dictionnaire colonne → liste de n valeurs, pour les 5 colonnes de base.
+    """
+    randint = rng.randint
+    rows_range = range(n)
+    return {
+        "nb_sej": [randint(100, 30_000) for _ in rows_range],
+        "duree_moy_sej": [randint(100, 1500) / 100 for _ in rows_range],
+        "tx_dc": [randint(0, 1000) / 10_000 for _ in rows_range],
+        "tx_male": [randint(3000, 7000) / 10_000 for _ in rows_range],
+        "age_moy": [randint(300, 850) / 10 for _ in rows_range],
+    }
+
+
+def generate_base_row(rng: random.Random) -> dict[str, Any]:
+    """
+    Génère les statistiques de base d'une ligne mock MCO.
+
+    Retourne un dictionnaire avec les 5 colonnes statistiques communes
+    à la plupart des endpoints. Les plages de valeurs sont celles de
+    generate_base_columns() (une seule ligne est tirée).
+
     Args:
         rng: instance de random.Random, permet le contrôle du seed.
              Exemple : rng = random.Random(42) pour résultats déterministes.
@@ -279,13 +539,7 @@ def generate_base_row(rng: random.Random) -> dict[str, Any]:
         Règle de cohérence : nb_pat <= nb_sej (un patient peut avoir
         plusieurs séjours, mais pas l'inverse).
     """
-    return {
-        "nb_sej": rng.randint(100, 30_000),
-        "duree_moy_sej": round(rng.uniform(1.0, 15.0), 2),
-        "tx_dc": round(rng.uniform(0.0, 0.10), 4),
-        "tx_male": round(rng.uniform(0.30, 0.70), 4),
-        "age_moy": round(rng.uniform(30.0, 85.0), 1),
-    }
+    return {col: values[0] for col, values in generate_base_columns(rng, 1).items()}
 
 
 def _generate_nb_pat(rng: random.Random, nb_sej: int) -> int:
@@ -298,6 +552,103 @@ def _generate_nb_pat(rng: random.Random, nb_sej: int) -> int:
     return rng.randint(int(nb_sej * 0.70), nb_sej)
 
 
+def _generate_nb_pat_column(rng: random.Random, nb_sej_col: list[int]) -> list[int]:
+    """
+    Génère la colonne nb_pat à partir de la colonne nb_sej (cf. _generate_nb_pat).
+
+    La borne basse (70 % de nb_sej) est calculée en arithmétique entière
+    (nb_sej * 7 // 10) : pas de multiplication flottante ni d'appel à int()
+    par ligne, et rng.randint est lié une seule fois à une variable locale.
+    """
+    randint = rng.randint
+    return [randint(nb_sej * 7 // 10, nb_sej) for nb_sej in nb_sej_col]
+
+
+def _generate_resume_stats(rng: random.Random, n: int) -> dict[str, list[Any]]:
+    """
+    Statistiques de n lignes /resume (avec var) et /resume_prec_annee :
+    les 5 colonnes de base, avec nb_pat inséré juste après nb_sej.
+    """
+    stats = generate_base_columns(rng, n)
+    return {
+        "nb_sej": stats["nb_sej"],
+        "nb_pat": _generate_nb_pat_column(rng, stats["nb_sej"]),
+        "duree_moy_sej": stats["duree_moy_sej"],
+        "tx_dc": stats["tx_dc"],
+        "tx_male": stats["tx_male"],
+        "age_moy": stats["age_moy"],
+    }
+
+
+# Signature commune des générateurs de statistiques : (rng, n) → colonnes
+_StatsBuilder = Callable[[random.Random, int], dict[str, list[Any]]]
+
+
+# Clé réservée sous laquelle la dimension primaire d'un endpoint (annee,
+# code_diag, datasource/code...) est échantillonnée avec les tokens de var.
+# Elle ne peut pas être produite par parse_var() (les tokens ne commencent
+# jamais par "_"), donc aucune colonne de var ne peut entrer en collision.
+_AXIS_KEY = "__axis"
+
+
+def _build_var_rows(
+    rng: random.Random,
+    var_tokens: Sequence[str],
+    make_stats: _StatsBuilder,
+    primary: tuple[str, Sequence[Any]] | None = None,
+    trancheage_param: str | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Construit les lignes d'un endpoint ventilé par var (produit cartésien).
+
+    Tronc commun des endpoints /resume, /resume_prec_annee, /diag_assoc, /um
+    et /actes : seules la dimension primaire éventuelle (annee, code_diag...)
+    et les colonnes statistiques changent d'un endpoint à l'autre.
+
+      1. Valeurs et colonnes de chaque token de var (précédées de la
+         dimension primaire si elle existe)
+      2. Échantillonnage du produit cartésien (au plus _MAX_ROWS lignes)
+      3. Statistiques des lignes retenues, colonne par colonne (make_stats)
+      4. Transposition en liste de lignes : colonnes var d'abord, puis stats
+
+    Sans var (var_tokens vide), le produit se réduit à la dimension primaire :
+    une ligne par code, plafonnée elle aussi à _MAX_ROWS.
+
+    Args:
+        rng: générateur aléatoire.
+        var_tokens: tokens issus de parse_var().
+        make_stats: fonction (rng, n) → dict colonne → n valeurs statistiques.
+        primary: dimension primaire (nom de colonne, valeurs), ex :
+                 ("code_diag", diag_codes). None pour /resume.
+        trancheage_param: bornes de tranches d'âge pour var=sexe_trancheage.
+
+    Returns:
+        Liste de dicts, une entrée par combinaison retenue.
+    """
+    all_var_values: list[Sequence[Any]] = []
+    all_var_columns: list[tuple[str, ...]] = []
+
+    # La dimension primaire est échantillonnée sous une clé privée (_AXIS_KEY) :
+    # un token de var du même nom (ex : var=annee sur /resume_prec_annee) ne
+    # peut pas écraser ses valeurs dans le dict des colonnes.
+    if primary is not None:
+        primary_col, primary_values = primary
+        all_var_values.append(primary_values)
+        all_var_columns.append((_AXIS_KEY,))
+
+    for token in var_tokens:
+        all_var_values.append(get_var_values(token, trancheage_param))
+        all_var_columns.append(_get_var_columns(token))
+
+    n_rows, var_columns = _sample_var_columns(rng, all_var_values, all_var_columns)
+    if primary is not None:
+        # Colonne primaire en tête ; une colonne de var homonyme est ignorée
+        axis = var_columns.pop(_AXIS_KEY)
+        var_columns.pop(primary_col, None)
+        var_columns = {primary_col: axis, **var_columns}
+    return _rows_from_columns({**var_columns, **make_stats(rng, n_rows)})
+
+
 # =============================================================================
 # GÉNÉRATION DES LIGNES DE RÉPONSE — GET /resume
 # =============================================================================
@@ -349,7 +700,7 @@ def generate_resume_rows(
         → [{"duree": 0, "nb_sej": 25432}, {"duree": 1, "nb_sej": 18765}, ...]
     """
     # Initialiser le générateur aléatoire (reproductible si seed fourni)
-    rng = random.Random(seed)
+    rng = _get_rng(seed)
 
     # Découper le paramètre var en tokens
     var_tokens = parse_var(var)
@@ -368,7 +719,7 @@ def generate_resume_rows(
     # CAS 2 — CAS SPÉCIAL var=duree seul : distribution DMS
     # La réponse n'a que duree + nb_sej, pas les autres colonnes (spec §3.1)
     # -------------------------------------------------------------------------
-    if var_tokens == ["duree"]:
+    if var_tokens == ("duree",):
         duree_values = get_var_values("duree")
         rows = []
         nb_sej_total = rng.randint(50_000, 150_000)
@@ -383,65 +734,12 @@ def generate_resume_rows(
     # CAS 3 — Avec var : produit cartésien des valeurs de chaque token
     # -------------------------------------------------------------------------
 
-    # Pour chaque token, récupérer la liste de valeurs et les colonnes associées
-    all_var_values: list[list[Any]] = []
-    all_var_columns: list[list[str]] = []
-
-    for token in var_tokens:
-        values = get_var_values(token, trancheage_param)
-        columns = _get_var_columns(token)
-        all_var_values.append(values)
-        all_var_columns.append(columns)
-
-    # Calculer le produit cartésien de toutes les valeurs
-    # Exemple : product(["M","C"], [1,2]) → [("M",1), ("M",2), ("C",1), ("C",2)]
-    rows: list[dict[str, Any]] = []
-
-    for combo in product(*all_var_values):
-        # combo est un tuple : une valeur (ou tuple de valeurs) par token
-        # Exemple avec var="ghm_typhosp" : combo = ("05M09T", "M")
-        # Exemple avec var="sexe_trancheage" : combo = (("1", "[0-10 ans]"),)
-
-        # Construire les colonnes de ventilation pour cette combinaison
-        var_cols: dict[str, Any] = {}
-        for i, (token_cols, token_val) in enumerate(
-            zip(all_var_columns, combo)
-        ):
-            if len(token_cols) > 1:
-                # Var composé : token_val est un tuple de valeurs
-                # Exemple : token_cols=["sexe","trancheage"], token_val=("1","[0-10 ans]")
-                for col, val in zip(token_cols, token_val):
-                    var_cols[col] = val
-            else:
-                # Var simple : token_val est un scalaire
-                var_cols[token_cols[0]] = token_val
-
-        # Générer les statistiques de base pour cette ligne
-        stats = generate_base_row(rng)
-        nb_pat = _generate_nb_pat(rng, stats["nb_sej"])
-
-        # Avec var, nb_pat est toujours inclus dans la réponse (spec §3.1)
-        # Colonnes var en premier (convention spec), puis statistiques
-        row: dict[str, Any] = {
-            **var_cols,
-            "nb_sej": stats["nb_sej"],
-            "nb_pat": nb_pat,
-            "duree_moy_sej": stats["duree_moy_sej"],
-            "tx_dc": stats["tx_dc"],
-            "tx_male": stats["tx_male"],
-            "age_moy": stats["age_moy"],
-        }
-        rows.append(row)
-
-    # Limiter le nombre de lignes pour les produits cartésiens très larges
-    # (ex : finess × dp × mois = 7 × 12 × 12 = 1008 lignes → trop)
-    max_rows = 100
-    if len(rows) > max_rows:
-        # Mélanger avant de couper pour garder une diversité représentative
-        rng.shuffle(rows)
-        rows = rows[:max_rows]
-
-    return rows
+    # Produit cartésien plafonné à _MAX_ROWS combinaisons tirées au hasard ;
+    # avec var, nb_pat est toujours inclus dans la réponse (spec §3.1).
+    # Colonnes var en premier (convention spec), puis statistiques.
+    return _build_var_rows(
+        rng, var_tokens, _generate_resume_stats, trancheage_param=trancheage_param,
+    )
 
 
 # =============================================================================
@@ -449,6 +747,18 @@ def generate_resume_rows(
 # =============================================================================
 
 
+# Établissements publics dans notre nomenclature FINESS (codes connus)
+# Les codes 130, 750, 690, 330, 310 sont des hôpitaux publics (CHU/CH)
+# Les codes 440, 060 sont des cliniques privées
+_FINESS_PUBLICS = frozenset({"130783293", "750100018", "690023154", "330781196", "310781406"})
+
+# (secteur, categ) de chaque établissement, calculé une fois au chargement
+_FINESS_SECTEUR_CATEG: dict[str, tuple[str, str]] = {
+    code: ("PU", "CH") if code in _FINESS_PUBLICS else ("PR", "CL")
+    for code in FINESS
+}
+
+
 def generate_dernier_trans_rows(
     annee_param: str,
     seed: int | None = None,
@@ -471,40 +781,31 @@ def generate_dernier_trans_rows(
     Returns:
         Liste de dicts, une entrée par établissement FINESS.
     """
-    rng = random.Random(seed)
+    rng = _get_rng(seed)
 
     # Conversion 2 chiffres → 4 chiffres
     # Convention : on suppose que les années sont toutes dans le 21e siècle
     annee_4ch = 2000 + int(annee_param)
 
-    # Établissements publics dans notre nomenclature FINESS (codes connus)
-    # Les codes 130, 750, 690, 330, 310 sont des hôpitaux publics (CHU/CH)
-    # Les codes 440, 060 sont des cliniques privées
-    finess_publics = {"130783293", "750100018", "690023154", "330781196", "310781406"}
+    # Générer une date de transmission réaliste dans l'année n+1
+    # (les transmissions de l'année N se font début de l'année N+1).
+    # Les mois et jours de tous les établissements sont tirés en un seul
+    # appel par colonne (rng.choices) plutôt que deux randint par ligne.
+    n = len(FINESS)
+    mois_col = rng.choices(range(1, 4), k=n)      # Janvier à Mars
+    jour_col = rng.choices(range(1, 29), k=n)     # Jours valides pour tous les mois
+    annee_trans = annee_4ch + 1
 
     rows = []
-    for finess_code, rs in FINESS.items():
-        # Déterminer le secteur et la catégorie selon le code FINESS
-        if finess_code in finess_publics:
-            secteur = "PU"
-            categ = "CH"
-        else:
-            secteur = "PR"
-            categ = "CL"
-
-        # Générer une date de transmission réaliste dans l'année n+1
-        # (les transmissions de l'année N se font début de l'année N+1)
-        mois = rng.randint(1, 3)          # Janvier à Mars
-        jour = rng.randint(1, 28)         # Jours valides pour tous les mois
-        date_trans = f"{annee_4ch + 1}-{mois:02d}-{jour:02d}"
-
+    for (finess_code, rs), mois, jour in zip(FINESS.items(), mois_col, jour_col):
+        secteur, categ = _FINESS_SECTEUR_CATEG[finess_code]
         rows.append({
             "annee": annee_4ch,
             "finess": finess_code,
             "rs": rs,
             "secteur": secteur,
             "categ": categ,
-            "derniere_transmission": date_trans,
+            "derniere_transmission": f"{annee_trans}-{mois:02d}-{jour:02d}",
         })
 
     return rows
@@ -515,6 +816,16 @@ def generate_dernier_trans_rows(
 # =============================================================================
 
 
+# Codes géographiques par valeur de type_geo, calculés une fois au chargement
+_GEO_CODES: dict[str, tuple[str, ...]] = {
+    "dep": tuple(DEPARTEMENTS),
+    "reg": tuple(REGIONS),
+    "zon": ZONES_ARS,
+    "ts": TERRITOIRES_SANTE,
+    "geo": CODEGEO,
+}
+
+
 def generate_tx_recours_rows(
     type_geo: str = "dep",
     seed: int | None = None,
@@ -539,35 +850,30 @@ def generate_tx_recours_rows(
     Returns:
         Liste de dicts, une entrée par zone géographique.
     """
-    rng = random.Random(seed)
-
-    # Mapper le type géographique vers la nomenclature correspondante
-    # Chaque entrée est soit un dict (code → libellé) soit une list (codes)
-    geo_nomenclatures: dict[str, list[str]] = {
-        "dep": list(DEPARTEMENTS.keys()),
-        "reg": list(REGIONS.keys()),
-        "zon": list(ZONES_ARS),
-        "ts": list(TERRITOIRES_SANTE),
-        "geo": list(CODEGEO),
-    }
+    rng = _get_rng(seed)
 
     # Utiliser "dep" par défaut si le type est inconnu
-    codes = geo_nomenclatures.get(type_geo, geo_nomenclatures["dep"])
+    codes = _GEO_CODES.get(type_geo, _GEO_CODES["dep"])
+
+    # Méthodes du générateur liées une fois à des variables locales : la
+    # boucle n'a plus à résoudre rng.randint / rng.uniform à chaque appel
+    randint = rng.randint
+    uniform = rng.uniform
 
     rows = []
     for code in codes:
         # Population de la zone : entre 100 000 et 5 000 000 habitants
-        nb_pop = rng.randint(100_000, 5_000_000)
+        nb_pop = randint(100_000, 5_000_000)
         # Nombre de séjours et patients cohérents avec la population
         # Taux brut réaliste : 60 à 120 séjours pour 1000 habitants
-        tx_brut_sej = rng.uniform(60.0, 120.0)
-        tx_brut_pat = tx_brut_sej * rng.uniform(0.80, 0.95)  # patients < séjours
+        tx_brut_sej = uniform(60.0, 120.0)
+        tx_brut_pat = tx_brut_sej * uniform(0.80, 0.95)  # patients < séjours
 
         nb_sej = int(nb_pop * tx_brut_sej / 1000)
         nb_pat = int(nb_pop * tx_brut_pat / 1000)
 
         # Taux standardisés : ajustement ±5% autour du taux brut
-        facteur_std = rng.uniform(0.95, 1.05)
+        facteur_std = uniform(0.95, 1.05)
         tx_std_sej = round(tx_brut_sej * facteur_std, 2)
         tx_std_pat = round(tx_brut_pat * facteur_std, 2)
 
@@ -617,7 +923,7 @@ def generate_resume_prec_annee_rows(
     Returns:
         Liste de dicts. Chaque dict contient 'annee' + statistiques de base.
     """
-    rng = random.Random(seed)
+    rng = _get_rng(seed)
 
     # Générer 5 années consécutives se terminant à annee_param
     annee_int = 2000 + int(annee_param)
@@ -627,74 +933,21 @@ def generate_resume_prec_annee_rows(
 
     # -------------------------------------------------------------------------
     # CAS 1 — Sans var : 1 ligne par année
+    # Les statistiques des 5 lignes sont tirées colonne par colonne.
     # -------------------------------------------------------------------------
     if not var_tokens:
-        rows = []
-        for annee in annees:
-            stats = generate_base_row(rng)
-            nb_pat = _generate_nb_pat(rng, stats["nb_sej"])
-            row: dict[str, Any] = {
-                "annee": annee,
-                "nb_sej": stats["nb_sej"],
-                "nb_pat": nb_pat,
-                "duree_moy_sej": stats["duree_moy_sej"],
-                "tx_dc": stats["tx_dc"],
-                "tx_male": stats["tx_male"],
-                "age_moy": stats["age_moy"],
-            }
-            rows.append(row)
-        return rows
+        return _rows_from_columns({
+            "annee": annees,
+            **_generate_resume_stats(rng, len(annees)),
+        })
 
     # -------------------------------------------------------------------------
     # CAS 2 — Avec var : produit cartésien années × valeurs de var
     # L'année est traitée comme une première dimension de ventilation.
     # -------------------------------------------------------------------------
-
-    # Construire les listes de valeurs et de colonnes pour chaque token
-    all_var_values: list[list[Any]] = [annees]       # l'année est la 1ère dimension
-    all_var_columns: list[list[str]] = [["annee"]]
-
-    for token in var_tokens:
-        values = get_var_values(token, trancheage_param)
-        columns = _get_var_columns(token)
-        all_var_values.append(values)
-        all_var_columns.append(columns)
-
-    rows = []
-    for combo in product(*all_var_values):
-        # combo[0] = l'année, combo[1:] = les valeurs des tokens var
-
-        # Construire les colonnes de ventilation
-        var_cols: dict[str, Any] = {"annee": combo[0]}
-        for token_cols, token_val in zip(all_var_columns[1:], combo[1:]):
-            if len(token_cols) > 1:
-                # Var composé : token_val est un tuple
-                for col, val in zip(token_cols, token_val):
-                    var_cols[col] = val
-            else:
-                var_cols[token_cols[0]] = token_val
-
-        stats = generate_base_row(rng)
-        nb_pat = _generate_nb_pat(rng, stats["nb_sej"])
-
-        row = {
-            **var_cols,
-            "nb_sej": stats["nb_sej"],
-            "nb_pat": nb_pat,
-            "duree_moy_sej": stats["duree_moy_sej"],
-            "tx_dc": stats["tx_dc"],
-            "tx_male": stats["tx_male"],
-            "age_moy": stats["age_moy"],
-        }
-        rows.append(row)
-
-    # Limiter le nombre de lignes pour les produits cartésiens très larges
-    max_rows = 100
-    if len(rows) > max_rows:
-        rng.shuffle(rows)
-        rows = rows[:max_rows]
-
-    return rows
+    return _build_var_rows(
+        rng, var_tokens, _generate_resume_stats, ("annee", annees), trancheage_param,
+    )
 
 
 # =============================================================================
@@ -702,6 +955,10 @@ def generate_resume_prec_annee_rows(
 # =============================================================================
 
 
+# Codes CIM-10 de la nomenclature (identifiant primaire de /diag_assoc)
+_CIM10_CODES = tuple(CIM10)
+
+
 def generate_diag_assoc_rows(
     var: str | None = None,
     seed: int | None = None,
@@ -727,74 +984,50 @@ def generate_diag_assoc_rows(
     Returns:
         Liste de dicts. Chaque dict contient 'code_diag' + statistiques.
     """
-    rng = random.Random(seed)
+    rng = _get_rng(seed)
 
     # L'identifiant primaire est toujours code_diag (codes CIM-10 de la nomenclature)
-    diag_codes = list(CIM10.keys())
+    diag_codes = _CIM10_CODES
     var_tokens = parse_var(var)
 
-    # -------------------------------------------------------------------------
-    # CAS 1 — Sans var : 1 ligne par code CIM-10
-    # -------------------------------------------------------------------------
-    if not var_tokens:
-        rows = []
-        for code in diag_codes:
-            stats = generate_base_row(rng)
-            row: dict[str, Any] = {
-                "code_diag": code,
-                "nb_sej": stats["nb_sej"],
-                "duree_moy_sej": stats["duree_moy_sej"],
-                "tx_dc": stats["tx_dc"],
-                "tx_male": stats["tx_male"],
-                "age_moy": stats["age_moy"],
-            }
-            rows.append(row)
-        return rows
+    # Sans var : 1 ligne par code CIM-10.
+    # Avec var  : produit cartésien code_diag × var_values.
+    # Dans les deux cas, au plus _MAX_ROWS lignes (codes tirés au hasard au-delà),
+    # et les statistiques ne sont générées que pour les lignes renvoyées.
+    return _build_var_rows(
+        rng, var_tokens, generate_base_columns, ("code_diag", diag_codes),
+    )
 
-    # -------------------------------------------------------------------------
-    # CAS 2 — Avec var : produit cartésien code_diag × var_values
-    # -------------------------------------------------------------------------
-    all_var_values: list[list[Any]] = [diag_codes]
-    all_var_columns: list[list[str]] = [["code_diag"]]
 
-    for token in var_tokens:
-        values = get_var_values(token)
-        columns = _get_var_columns(token)
-        all_var_values.append(values)
-        all_var_columns.append(columns)
+# =============================================================================
+# GÉNÉRATION DES LIGNES DE RÉPONSE — GET /um
+# =============================================================================
 
-    rows = []
-    for combo in product(*all_var_values):
-        var_cols: dict[str, Any] = {"code_diag": combo[0]}
-        for token_cols, token_val in zip(all_var_columns[1:], combo[1:]):
-            if len(token_cols) > 1:
-                for col, val in zip(token_cols, token_val):
-                    var_cols[col] = val
-            else:
-                var_cols[token_cols[0]] = token_val
-
-        stats = generate_base_row(rng)
-        row = {
-            **var_cols,
-            "nb_sej": stats["nb_sej"],
-            "duree_moy_sej": stats["duree_moy_sej"],
-            "tx_dc": stats["tx_dc"],
-            "tx_male": stats["tx_male"],
-            "age_moy": stats["age_moy"],
-        }
-        rows.append(row)
-
-    max_rows = 100
-    if len(rows) > max_rows:
-        rng.shuffle(rows)
-        rows = rows[:max_rows]
 
-    return rows
+# Types d'UM de la nomenclature (identifiant primaire de /um)
+_TYPE_UM_CODES = tuple(TYPE_UM)
 
 
-# =============================================================================
-# GÉNÉRATION DES LIGNES DE RÉPONSE — GET /um
-# =============================================================================
+def _generate_um_stats(rng: random.Random, n: int) -> dict[str, list[Any]]:
+    """
+    Statistiques de n lignes /um : les 5 colonnes de base, avec duree_moy_rum
+    inséré juste après duree_moy_sej.
+
+    duree_moy_rum est toujours < duree_moy_sej (le RUM est un sous-séjour) :
+    on applique un facteur aléatoire entre 0.5 et 0.95.
+    """
+    stats = generate_base_columns(rng, n)
+    uniform = rng.uniform
+    return {
+        "nb_sej": stats["nb_sej"],
+        "duree_moy_sej": stats["duree_moy_sej"],
+        "duree_moy_rum": [
+            round(duree * uniform(0.5, 0.95), 2) for duree in stats["duree_moy_sej"]
+        ],
+        "tx_dc": stats["tx_dc"],
+        "tx_male": stats["tx_male"],
+        "age_moy": stats["age_moy"],
+    }
 
 
 def generate_um_rows(
@@ -821,79 +1054,60 @@ def generate_um_rows(
     Returns:
         Liste de dicts. Chaque dict contient 'code_rum', 'duree_moy_rum' + stats.
     """
-    rng = random.Random(seed)
+    rng = _get_rng(seed)
 
     # L'identifiant primaire est code_rum (types d'UM de la nomenclature)
-    um_codes = list(TYPE_UM.keys())
+    um_codes = _TYPE_UM_CODES
     var_tokens = parse_var(var)
 
-    # -------------------------------------------------------------------------
-    # CAS 1 — Sans var : 1 ligne par type d'UM
-    # -------------------------------------------------------------------------
-    if not var_tokens:
-        rows = []
-        for code in um_codes:
-            stats = generate_base_row(rng)
-            # duree_moy_rum est toujours < duree_moy_sej (le RUM est un sous-séjour)
-            duree_moy_rum = round(stats["duree_moy_sej"] * rng.uniform(0.5, 0.95), 2)
-            row: dict[str, Any] = {
-                "code_rum": code,
-                "nb_sej": stats["nb_sej"],
-                "duree_moy_sej": stats["duree_moy_sej"],
-                "duree_moy_rum": duree_moy_rum,
-                "tx_dc": stats["tx_dc"],
-                "tx_male": stats["tx_male"],
-                "age_moy": stats["age_moy"],
-            }
-            rows.append(row)
-        return rows
+    # Sans var : 1 ligne par type d'UM.
+    # Avec var  : produit cartésien code_rum × var_values.
+    # Dans les deux cas, au plus _MAX_ROWS lignes (cf. _build_var_rows).
+    return _build_var_rows(rng, var_tokens, _generate_um_stats, ("code_rum", um_codes))
 
-    # -------------------------------------------------------------------------
-    # CAS 2 — Avec var : produit cartésien code_rum × var_values
-    # -------------------------------------------------------------------------
-    all_var_values: list[list[Any]] = [um_codes]
-    all_var_columns: list[list[str]] = [["code_rum"]]
 
-    for token in var_tokens:
-        values = get_var_values(token)
-        columns = _get_var_columns(token)
-        all_var_values.append(values)
-        all_var_columns.append(columns)
+# =============================================================================
+# GÉNÉRATION DES LIGNES DE RÉPONSE — GET /actes
+# =============================================================================
 
-    rows = []
-    for combo in product(*all_var_values):
-        var_cols: dict[str, Any] = {"code_rum": combo[0]}
-        for token_cols, token_val in zip(all_var_columns[1:], combo[1:]):
-            if len(token_cols) > 1:
-                for col, val in zip(token_cols, token_val):
-                    var_cols[col] = val
-            else:
-                var_cols[token_cols[0]] = token_val
-
-        stats = generate_base_row(rng)
-        duree_moy_rum = round(stats["duree_moy_sej"] * rng.uniform(0.5, 0.95), 2)
-        row = {
-            **var_cols,
-            "nb_sej": stats["nb_sej"],
-            "duree_moy_sej": stats["duree_moy_sej"],
-            "duree_moy_rum": duree_moy_rum,
-            "tx_dc": stats["tx_dc"],
-            "tx_male": stats["tx_male"],
-            "age_moy": stats["age_moy"],
-        }
-        rows.append(row)
-
-    max_rows = 100
-    if len(rows) > max_rows:
-        rng.shuffle(rows)
-        rows = rows[:max_rows]
 
-    return rows
+# Codes CCAM de la nomenclature (identifiant primaire de /actes)
+_CCAM_CODES = tuple(CCAM)
 
+# Valeurs possibles des colonnes catégorielles de /actes
+_EXT_PMSI = ("0", "1")
+_ACTE_ACTIV = ("1", "2", "3", "4", "5")
+_IS_CLASSANT = (0, 1)
 
-# =============================================================================
-# GÉNÉRATION DES LIGNES DE RÉPONSE — GET /actes
-# =============================================================================
+
+def _generate_actes_columns(rng: random.Random, n: int) -> dict[str, list[Any]]:
+    """
+    Génère les colonnes statistiques de n lignes de l'endpoint /actes.
+
+    Le schéma /actes est spécifique (pas de tx_dc ni de nb_pat, spec §3.6) :
+    on ne réutilise donc pas generate_base_columns().
+
+    Règle de cohérence : nb_sej <= nb_acte (un séjour peut avoir plusieurs
+    actes du même code), avec nb_sej entre 80 % et 100 % de nb_acte.
+
+    Les colonnes catégorielles sont tirées en un seul appel rng.choices(k=n)
+    chacune, plutôt qu'un rng.choice par ligne.
+    """
+    randint = rng.randint
+    choices = rng.choices
+    rows_range = range(n)
+    nb_acte = [randint(500, 10_000) for _ in rows_range]
+    return {
+        "extension_pmsi": choices(_EXT_PMSI, k=n),
+        "nb_acte": nb_acte,
+        # Borne basse en arithmétique entière : 80 % de nb_acte = nb * 4 // 5
+        "nb_sej": [randint(nb * 4 // 5, nb) for nb in nb_acte],
+        "duree_moy_sej": [randint(100, 1500) / 100 for _ in rows_range],
+        "tx_male": [randint(3000, 7000) / 10_000 for _ in rows_range],
+        "age_moy": [randint(300, 850) / 10 for _ in rows_range],
+        "acte_activ": choices(_ACTE_ACTIV, k=n),
+        "is_classant": choices(_IS_CLASSANT, k=n),
+    }
 
 
 def generate_actes_rows(
@@ -920,83 +1134,115 @@ def generate_actes_rows(
     Returns:
         Liste de dicts. Chaque dict contient les colonnes spécifiques CCAM.
     """
-    rng = random.Random(seed)
+    rng = _get_rng(seed)
 
     # L'identifiant primaire est code_ccam (codes de la nomenclature CCAM)
-    ccam_codes = list(CCAM.keys())
+    ccam_codes = _CCAM_CODES
     var_tokens = parse_var(var)
 
-    # -------------------------------------------------------------------------
-    # CAS 1 — Sans var : 1 ligne par code CCAM
-    # -------------------------------------------------------------------------
-    if not var_tokens:
-        rows = []
-        for code in ccam_codes:
-            nb_acte = rng.randint(500, 10_000)
-            # nb_sej <= nb_acte (un séjour peut avoir plusieurs actes du même code)
-            nb_sej = rng.randint(int(nb_acte * 0.8), nb_acte)
-            row: dict[str, Any] = {
-                "code_ccam": code,
-                "extension_pmsi": rng.choice(["0", "1"]),
-                "nb_acte": nb_acte,
-                "nb_sej": nb_sej,
-                "duree_moy_sej": round(rng.uniform(1.0, 15.0), 2),
-                "tx_male": round(rng.uniform(0.30, 0.70), 4),
-                "age_moy": round(rng.uniform(30.0, 85.0), 1),
-                "acte_activ": rng.choice(["1", "2", "3", "4", "5"]),
-                "is_classant": rng.choice([0, 1]),
-            }
-            rows.append(row)
-        return rows
+    # Sans var : 1 ligne par code CCAM.
+    # Avec var  : produit cartésien code_ccam × var_values.
+    # Dans les deux cas, au plus _MAX_ROWS lignes (cf. _build_var_rows).
+    return _build_var_rows(
+        rng, var_tokens, _generate_actes_columns, ("code_ccam", ccam_codes),
+    )
 
-    # -------------------------------------------------------------------------
-    # CAS 2 — Avec var : produit cartésien code_ccam × var_values
-    # -------------------------------------------------------------------------
-    all_var_values: list[list[Any]] = [ccam_codes]
-    all_var_columns: list[list[str]] = [["code_ccam"]]
 
-    for token in var_tokens:
-        values = get_var_values(token)
-        columns = _get_var_columns(token)
-        all_var_values.append(values)
-        all_var_columns.append(columns)
+# =============================================================================
+# GÉNÉRATION DES LIGNES DE RÉPONSE — GET /dmi_med
+# =============================================================================
 
-    rows = []
-    for combo in product(*all_var_values):
-        var_cols: dict[str, Any] = {"code_ccam": combo[0]}
-        for token_cols, token_val in zip(all_var_columns[1:], combo[1:]):
-            if len(token_cols) > 1:
-                for col, val in zip(token_cols, token_val):
-                    var_cols[col] = val
-            else:
-                var_cols[token_cols[0]] = token_val
-
-        nb_acte = rng.randint(500, 10_000)
-        nb_sej = rng.randint(int(nb_acte * 0.8), nb_acte)
-        row = {
-            **var_cols,
-            "extension_pmsi": rng.choice(["0", "1"]),
-            "nb_acte": nb_acte,
-            "nb_sej": nb_sej,
-            "duree_moy_sej": round(rng.uniform(1.0, 15.0), 2),
-            "tx_male": round(rng.uniform(0.30, 0.70), 4),
-            "age_moy": round(rng.uniform(30.0, 85.0), 1),
-            "acte_activ": rng.choice(["1", "2", "3", "4", "5"]),
-            "is_classant": rng.choice([0, 1]),
-        }
-        rows.append(row)
-
-    max_rows = 100
-    if len(rows) > max_rows:
-        rng.shuffle(rows)
-        rows = rows[:max_rows]
 
-    return rows
+# Premier axe du produit cartésien de /dmi_med : (datasource, code) pour
+# chaque code UCD (médicaments) puis chaque code LPP (DMI) de la nomenclature
+_MED_DMI_AXIS: tuple[tuple[str, str], ...] = (
+    tuple(("med", code) for code in UCD) + tuple(("dmi", code) for code in LPP)
+)
 
+# Hiérarchie LPP associée à chaque code LPP (correspondance simplifiée pour le
+# mock : les hiérarchies sont attribuées à tour de rôle dans l'ordre des codes).
+# Calculée une fois ici plutôt qu'à chaque ligne DMI générée.
+_HIERA_CODES = tuple(HIERA_LPP)
+_LPP_TO_HIERA: dict[str, str] = {
+    code: _HIERA_CODES[i % len(_HIERA_CODES)] for i, code in enumerate(LPP)
+}
 
-# =============================================================================
-# GÉNÉRATION DES LIGNES DE RÉPONSE — GET /dmi_med
-# =============================================================================
+# Classification ATC (niveaux 1 à 5) de chaque code UCD, sous forme de tuple
+_ATC_LEVELS = ("atc1", "atc2", "atc3", "atc4", "atc5")
+_ATC_BY_UCD: dict[str, tuple[str | None, ...]] = {
+    code: tuple(atc.get(level) for level in _ATC_LEVELS) for code, atc in ATC_DATA.items()
+}
+_EMPTY_ATC: tuple[None, ...] = (None,) * len(_ATC_LEVELS)
+
+
+def _generate_med_columns(rng: random.Random, codes_ucd: list[str]) -> dict[str, list[Any]]:
+    """
+    Génère les colonnes des lignes médicaments (datasource='med'), une par code UCD.
+
+    code_lpp, hiera et hiera_libelle sont à None (colonnes propres aux DMI).
+    """
+    randint = rng.randint
+    n = len(codes_ucd)
+    rows_range = range(n)
+    atc = [_ATC_BY_UCD.get(code, _EMPTY_ATC) for code in codes_ucd]
+    nb = [randint(1_000, 10_000) for _ in rows_range]
+    nb_sej = [randint(int(x * 0.3), x) for x in nb]
+    none_col = [None] * n
+    return {
+        "datasource": ["med"] * n,
+        "code": codes_ucd,
+        "code_ucd": codes_ucd,
+        "lib_ucd": [UCD.get(code) for code in codes_ucd],
+        "atc1": [a[0] for a in atc],
+        "atc2": [a[1] for a in atc],
+        "atc3": [a[2] for a in atc],
+        "atc4": [a[3] for a in atc],
+        "atc5": [a[4] for a in atc],
+        "nb": nb,
+        "nb_sej": nb_sej,
+        "nb_pat": _generate_nb_pat_column(rng, nb_sej),
+        "mnt_remb": [randint(1_000_000, 200_000_000) / 100 for _ in rows_range],
+        "duree_moy_sej": [randint(100, 1000) / 100 for _ in rows_range],
+        "age_moy": [randint(400, 800) / 10 for _ in rows_range],
+        "code_lpp": none_col,
+        "hiera": none_col,
+        "hiera_libelle": none_col,
+    }
+
+
+def _generate_dmi_columns(rng: random.Random, codes_lpp: list[str]) -> dict[str, list[Any]]:
+    """
+    Génère les colonnes des lignes DMI (datasource='dmi'), une par code LPP.
+
+    code_ucd, lib_ucd et atc1..atc5 sont à None (colonnes propres aux médicaments).
+    """
+    randint = rng.randint
+    n = len(codes_lpp)
+    rows_range = range(n)
+    hiera = [_LPP_TO_HIERA[code] for code in codes_lpp]
+    nb = [randint(100, 2_000) for _ in rows_range]
+    none_col = [None] * n
+    return {
+        "datasource": ["dmi"] * n,
+        "code": codes_lpp,
+        "code_ucd": none_col,
+        "lib_ucd": none_col,
+        "atc1": none_col,
+        "atc2": none_col,
+        "atc3": none_col,
+        "atc4": none_col,
+        "atc5": none_col,
+        "nb": nb,
+        # Pour les DMI, nb_sej ≈ nb (1 DMI par séjour en général)
+        "nb_sej": nb,
+        "nb_pat": _generate_nb_pat_column(rng, nb),
+        "mnt_remb": [randint(500_000, 50_000_000) / 100 for _ in rows_range],
+        "duree_moy_sej": [randint(200, 1200) / 100 for _ in rows_range],
+        "age_moy": [randint(500, 800) / 10 for _ in rows_range],
+        "code_lpp": codes_lpp,
+        "hiera": hiera,
+        "hiera_libelle": [HIERA_LPP.get(h) for h in hiera],
+    }
 
 
 def generate_dmi_med_rows(
@@ -1025,127 +1271,40 @@ def generate_dmi_med_rows(
     Returns:
         Liste de dicts avec structure med ou dmi selon le datasource.
     """
-    rng = random.Random(seed)
+    rng = _get_rng(seed)
 
     var_tokens = parse_var(var)
 
-    def _make_med_row(code_ucd: str, extra_cols: dict[str, Any]) -> dict[str, Any]:
-        """Crée une ligne médicament (datasource='med')."""
-        atc = ATC_DATA.get(code_ucd, {})
-        nb = rng.randint(1_000, 10_000)
-        nb_sej = rng.randint(int(nb * 0.3), nb)
-        nb_pat = rng.randint(int(nb_sej * 0.70), nb_sej)
-        return {
-            **extra_cols,
-            "datasource": "med",
-            "code": code_ucd,
-            "code_ucd": code_ucd,
-            "lib_ucd": UCD.get(code_ucd),
-            "atc1": atc.get("atc1"),
-            "atc2": atc.get("atc2"),
-            "atc3": atc.get("atc3"),
-            "atc4": atc.get("atc4"),
-            "atc5": atc.get("atc5"),
-            "nb": nb,
-            "nb_sej": nb_sej,
-            "nb_pat": nb_pat,
-            "mnt_remb": round(rng.uniform(10_000, 2_000_000), 2),
-            "duree_moy_sej": round(rng.uniform(1.0, 10.0), 2),
-            "age_moy": round(rng.uniform(40.0, 80.0), 1),
-            "code_lpp": None,
-            "hiera": None,
-            "hiera_libelle": None,
-        }
-
-    def _make_dmi_row(code_lpp: str, extra_cols: dict[str, Any]) -> dict[str, Any]:
-        """Crée une ligne DMI (datasource='dmi')."""
-        # Associer une hiérarchie LPP au code (correspondance simplifiée pour le mock)
-        hiera_codes = list(HIERA_LPP.keys())
-        hiera = hiera_codes[list(LPP.keys()).index(code_lpp) % len(hiera_codes)]
-        nb = rng.randint(100, 2_000)
-        nb_sej = nb  # Pour les DMI, nb_sej ≈ nb (1 DMI par séjour en général)
-        nb_pat = rng.randint(int(nb_sej * 0.70), nb_sej)
-        return {
-            **extra_cols,
-            "datasource": "dmi",
-            "code": code_lpp,
-            "code_ucd": None,
-            "lib_ucd": None,
-            "atc1": None,
-            "atc2": None,
-            "atc3": None,
-            "atc4": None,
-            "atc5": None,
-            "nb": nb,
-            "nb_sej": nb_sej,
-            "nb_pat": nb_pat,
-            "mnt_remb": round(rng.uniform(5_000, 500_000), 2),
-            "duree_moy_sej": round(rng.uniform(2.0, 12.0), 2),
-            "age_moy": round(rng.uniform(50.0, 80.0), 1),
-            "code_lpp": code_lpp,
-            "hiera": hiera,
-            "hiera_libelle": HIERA_LPP.get(hiera),
-        }
-
-    ucd_codes = list(UCD.keys())
-    lpp_codes = list(LPP.keys())
-
-    # -------------------------------------------------------------------------
-    # CAS 1 — Sans var : 1 ligne par UCD + 1 ligne par LPP
-    # -------------------------------------------------------------------------
-    if not var_tokens:
-        rows = []
-        for code in ucd_codes:
-            rows.append(_make_med_row(code, {}))
-        for code in lpp_codes:
-            rows.append(_make_dmi_row(code, {}))
-        return rows
-
-    # -------------------------------------------------------------------------
-    # CAS 2 — Avec var : produit cartésien (UCD + LPP) × var_values
-    # On génère séparément les lignes med et dmi, puis on les concatène.
-    # -------------------------------------------------------------------------
-    all_var_values: list[list[Any]] = []
-    all_var_columns: list[list[str]] = []
+    # Les codes UCD (med) et LPP (dmi) forment le premier axe du produit
+    # cartésien avec les valeurs de var. Sans var, le produit se réduit à cet
+    # axe : une ligne par UCD + une ligne par LPP. Les combinaisons sont
+    # échantillonnées comme pour les autres endpoints (au plus _MAX_ROWS).
+    # L'axe est échantillonné sous la clé privée _AXIS_KEY (valeurs : tuples
+    # (datasource, code)) : var=code ou var=datasource ne peut pas l'écraser.
+    all_var_values: list[Sequence[Any]] = [_MED_DMI_AXIS]
+    all_var_columns: list[tuple[str, ...]] = [(_AXIS_KEY,)]
 
     for token in var_tokens:
-        values = get_var_values(token)
-        columns = _get_var_columns(token)
-        all_var_values.append(values)
-        all_var_columns.append(columns)
-
-    rows = []
-
-    # Générer les lignes médicaments
-    for ucd_code in ucd_codes:
-        for combo in product(*all_var_values):
-            extra_cols: dict[str, Any] = {}
-            for token_cols, token_val in zip(all_var_columns, combo):
-                if len(token_cols) > 1:
-                    for col, val in zip(token_cols, token_val):
-                        extra_cols[col] = val
-                else:
-                    extra_cols[token_cols[0]] = token_val
-            rows.append(_make_med_row(ucd_code, extra_cols))
-
-    # Générer les lignes DMI
-    for lpp_code in lpp_codes:
-        for combo in product(*all_var_values):
-            extra_cols = {}
-            for token_cols, token_val in zip(all_var_columns, combo):
-                if len(token_cols) > 1:
-                    for col, val in zip(token_cols, token_val):
-                        extra_cols[col] = val
-                else:
-                    extra_cols[token_cols[0]] = token_val
-            rows.append(_make_dmi_row(lpp_code, extra_cols))
-
-    max_rows = 100
-    if len(rows) > max_rows:
-        rng.shuffle(rows)
-        rows = rows[:max_rows]
-
-    return rows
+        all_var_values.append(get_var_values(token))
+        all_var_columns.append(_get_var_columns(token))
+
+    _, var_columns = _sample_var_columns(rng, all_var_values, all_var_columns)
+    axis = var_columns.pop(_AXIS_KEY)
+
+    # Répartition des lignes retenues selon leur datasource, lue dans la
+    # colonne elle-même (indices) : aucune hypothèse sur l'ordre des lignes.
+    # Chaque bloc est ensuite généré colonne par colonne avec son propre schéma.
+    med_idx = [i for i, (datasource, _) in enumerate(axis) if datasource == "med"]
+    dmi_idx = [i for i, (datasource, _) in enumerate(axis) if datasource == "dmi"]
+    med_rows = _rows_from_columns({
+        **{col: [values[i] for i in med_idx] for col, values in var_columns.items()},
+        **_generate_med_columns(rng, [axis[i][1] for i in med_idx]),
+    })
+    dmi_rows = _rows_from_columns({
+        **{col: [values[i] for i in dmi_idx] for col, values in var_columns.items()},
+        **_generate_dmi_columns(rng, [axis[i][1] for i in dmi_idx]),
+    })
+    return med_rows + dmi_rows
 
 
 # =============================================================================
@@ -9,17 +9,19 @@
 #      génération automatique de la doc Swagger, etc.
 #      Doc : https://fastapi.tiangolo.com/tutorial/first-steps/
 #
-#   2. @app.get("/")
-#      Un "décorateur de path operation". Il dit à FastAPI :
-#        - écoute les requêtes HTTP GET
-#        - sur le chemin "/"
-#        - et appelle la fonction décorée pour les traiter
-#      Doc : https://fastapi.tiangolo.com/tutorial/first-steps/#define-a-path-operation-decorator
-#
-#   3. Retour JSON automatique
-#      FastAPI sérialise automatiquement les dict et les list Python en JSON.
-#      Pas besoin de jsonify() comme en Flask.
-#      Doc : https://fastapi.tiangolo.com/tutorial/first-steps/#return-the-content
+#   2. Route("/", ..., include_in_schema=False) — route Starlette brute
+#      Le health check GET / n'est pas une path operation FastAPI
+#      (@app.get("/")) mais une Route Starlette insérée en tête de la table de
+#      routage par create_app() : ni dépendances ni validation, et absente de
+#      /docs. Détails dans le bloc « GET / — Endpoint de santé » plus bas.
+#      Doc : https://www.starlette.io/routing/#http-routing
+#
+#   3. Retour JSON
+#      Une path operation FastAPI peut retourner des dict/list Python : ils
+#      sont sérialisés en JSON par la classe de réponse par défaut (ici
+#      ORJSONResponse, voir create_app()). Le health check et les endpoints
+#      MCO retournent directement une Response contenant des bytes JSON.
+#      Doc : https://fastapi.tiangolo.com/advanced/custom-response/#orjsonresponse
 #
 #   4. app.include_router() — NOUVEAU (étape 4)
 #      Enregistre un APIRouter dans l'application principale.
@@ -43,21 +45,29 @@
 #   - "app"       : variable dans ce fichier (l'objet FastAPI())
 #   - "--reload"  : redémarre le serveur à chaque modification de fichier (dev uniquement)
 #
+# En production (voir Dockerfile), on impose la boucle d'événements uvloop et
+# le parseur HTTP httptools, tous deux écrits en C et fournis par
+# uvicorn[standard] :
+#   uvicorn app.main:app --host 0.0.0.0 --port 8000 --loop uvloop --http httptools
+#
 # Doc Swagger générée automatiquement : http://localhost:8000/docs
 # =============================================================================
 
 import logging
-import random
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from starlette.requests import Request
+from starlette.routing import Route
 
-from app.config import settings
+from app.config import get_settings
+from app.generators import mock_data
 
 # Import des routers — un module par endpoint.
 # Étape 4 : /resume (endpoint principal polyvalent)
@@ -100,7 +110,7 @@ logger = logging.getLogger(__name__)
 #   Cas d'usage typiques :
 #     - Initialiser une connexion à la base de données au démarrage
 #     - Libérer les ressources (connexions, fichiers) à l'arrêt
-#     - Fixer un seed aléatoire global (notre cas ici)
+#     - Journaliser la configuration effective au démarrage (notre cas ici)
 #
 #   Doc : https://fastapi.tiangolo.com/advanced/events/
 # =============================================================================
@@ -111,32 +121,38 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     """
     Gestionnaire de cycle de vie de l'application.
 
-    Startup : configure le générateur aléatoire selon le RANDOM_SEED configuré.
+    Startup : journalise la configuration (seed aléatoire, environnement, CORS)
+              et pré-remplit les caches du générateur de données.
     Shutdown : rien à faire pour ce projet (pas de connexion DB à fermer).
     """
     # --- Startup ---
-    if settings.random_seed is not None:
-        # Fixe le seed global du module random.
-        # Conséquence : toutes les données mock générées seront identiques
-        # d'un démarrage à l'autre, tant que le seed est le même.
-        # Utile pour les démos reproductibles et les tests d'intégration.
-        random.seed(settings.random_seed)
-        logger.info(
-            "Seed aléatoire fixé à %d (données mock déterministes)",
-            settings.random_seed,
-        )
-    else:
+    # Les messages ne sont construits que si le niveau INFO est actif pour ce
+    # logger (ex : désactivé sous pytest) : isEnabledFor() évite alors la
+    # lecture des réglages et le formatage des chaînes.
+    if logger.isEnabledFor(logging.INFO):
+        settings = get_settings()
+        if settings.random_seed is not None:
+            # Le seed est appliqué au générateur partagé des données mock
+            # (mock_data._DEFAULT_RNG) par mock_data.warmup() ci-dessous ;
+            # on se contente ici de le journaliser.
+            logger.info(
+                f"Seed aléatoire fixé à {settings.random_seed} "
+                "(données mock déterministes)"
+            )
+        else:
+            logger.info(
+                "Aucun seed configuré — données mock aléatoires à chaque appel "
+                "(définir RANDOM_SEED dans .env pour des données déterministes)"
+            )
+
         logger.info(
-            "Aucun seed configuré — données mock aléatoires à chaque appel "
-            "(définir RANDOM_SEED dans .env pour des données déterministes)"
+            f"API Mock MCO démarrée — environnement={settings.environment}, "
+            f"port={settings.port}, CORS={settings.cors_origins}"
         )
 
-    logger.info(
-        "API Mock MCO démarrée — environnement=%s, port=%d, CORS=%s",
-        settings.environment,
-        settings.port,
-        settings.cors_origins,
-    )
+    # Pré-remplissage des caches du générateur (tokens de var, tranches d'âge)
+    # pour que la première requête de chaque worker ne paie pas leur calcul.
+    mock_data.warmup()
 
     # `yield` sépare startup et shutdown.
     # L'application accepte les requêtes entre le yield et la fin du bloc.
@@ -185,19 +201,6 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
 #      Doc : https://fastapi.tiangolo.com/tutorial/handling-errors/#requestvalidationerror-vs-validationerror
 # =============================================================================
 
-# Instanciation de l'application FastAPI.
-# Les paramètres title, description et version alimentent la doc Swagger (/docs).
-# Le paramètre lifespan connecte notre gestionnaire de cycle de vie.
-app = FastAPI(
-    title="API Mock Activité MCO",
-    description=(
-        "API de simulation des données d'activité MCO (Médecine, Chirurgie, Obstétrique). "
-        "Permet de développer et tester des clients R sans connexion à la base PMSI réelle."
-    ),
-    version="0.1.0",
-    lifespan=lifespan,
-)
-
 
 # =============================================================================
 # Concept FastAPI — CORSMiddleware (étape 7)
@@ -208,7 +211,7 @@ app = FastAPI(
 #   vérifie d'abord si le serveur l'autorise via des en-têtes HTTP spéciaux.
 #
 #   FastAPI intègre le middleware CORS de Starlette. Il suffit de l'ajouter
-#   avec app.add_middleware() avant de déclarer les routes.
+#   avec app.add_middleware() (voir create_app() plus bas).
 #
 #   Paramètres importants :
 #     - allow_origins      : liste des origines autorisées (["*"] = tout autoriser)
@@ -222,19 +225,23 @@ app = FastAPI(
 #   Doc : https://fastapi.tiangolo.com/tutorial/cors/
 # =============================================================================
 
-app.add_middleware(
-    CORSMiddleware,
-    # Les origines sont lues depuis la configuration (variable CORS_ORIGINS).
-    # Par défaut "*" pour autoriser tout (utile en dev/démo).
-    allow_origins=settings.cors_origins_list,
-    # allow_credentials=True autoriserait les cookies et les en-têtes Authorization.
-    # On le désactive car cette API mock ne gère pas d'authentification.
-    allow_credentials=False,
-    # Autoriser toutes les méthodes HTTP (GET, POST, OPTIONS, etc.)
-    allow_methods=["*"],
-    # Autoriser tous les en-têtes HTTP
-    allow_headers=["*"],
-)
+
+# =============================================================================
+# Concept FastAPI — GZipMiddleware
+#
+#   Compresse le corps des réponses en gzip quand le client l'accepte
+#   (en-tête de requête Accept-Encoding: gzip, envoyé automatiquement par
+#   httr/curl côté R). Nos réponses sont des listes JSON de lignes aux clés
+#   répétées : elles se compressent très bien (typiquement 5 à 10×).
+#
+#   Paramètres :
+#     - minimum_size  : en dessous de cette taille (octets), la réponse est
+#                       envoyée telle quelle (ex : GET / → 15 octets)
+#     - compresslevel : 1 (rapide) à 9 (compact) ; 5 est un bon compromis
+#                       entre temps CPU et taux de compression
+#
+#   Doc : https://fastapi.tiangolo.com/advanced/middleware/#gzipmiddleware
+# =============================================================================
 
 
 # =============================================================================
@@ -245,29 +252,48 @@ app.add_middleware(
 #
 # La spec MCO §5.1 attend HTTP 400 (Bad Request) pour ces cas.
 # On installe un handler personnalisé qui intercepte RequestValidationError
-# et retourne 400 avec le même corps JSON que le 422 natif.
+# et retourne 400 avec un corps au format du 422 natif ({"detail": [...]}),
+# mais réduit : chaque erreur ne garde que type, loc et msg (input et ctx
+# sont retirés — voir la docstring du handler).
 #
 # Note : ce handler s'applique à TOUS les endpoints de l'application.
 # Les clients qui lisent uniquement le status_code recevront 400.
 # =============================================================================
 
+# En-têtes de la réponse 400, construits une seule fois au chargement du module.
+# Starlette ne fait que lire ce dict (il n'est jamais modifié) : il peut être
+# partagé entre toutes les réponses d'erreur au lieu d'être recréé à chaque appel.
+_VALIDATION_HEADERS = {"content-type": "application/json"}
+
 
-@app.exception_handler(RequestValidationError)
 async def validation_exception_handler(
     request: Request, exc: RequestValidationError
-) -> JSONResponse:
+) -> Response:
     """
     Transforme les erreurs de validation Pydantic (paramètres manquants ou invalides)
     en réponse HTTP 400 au lieu du 422 par défaut de FastAPI.
 
-    Le corps de la réponse conserve le format natif FastAPI :
-        {"detail": [{"loc": [...], "msg": "...", "type": "..."}]}
+    Le corps de la réponse reprend le format FastAPI, réduit aux clés utiles :
+        {"detail": [{"type": "...", "loc": [...], "msg": "..."}]}
     """
-    # exc.errors() retourne la liste des erreurs de validation Pydantic.
-    # Elle contient pour chaque erreur : loc (localisation), msg (message), type.
-    return JSONResponse(
+    # exc.errors() retourne la liste des erreurs de validation, déjà formatée
+    # une fois par FastAPI (sans le champ url). Chaque erreur contient aussi
+    # input (la valeur reçue) et, selon le cas, ctx (contexte du validateur,
+    # parfois des objets non JSON natifs). On ne garde que les trois clés
+    # utiles au client — type, loc, msg : moins d'octets à sérialiser et à
+    # transmettre, et un corps toujours encodable tel quel par orjson.
+    #
+    # Le corps est sérialisé directement avec orjson (même encodeur que les
+    # réponses des endpoints) et placé dans une Response brute : pas de
+    # passage par la classe de réponse générique.
+    errors = [
+        {"type": error["type"], "loc": error["loc"], "msg": error["msg"]}
+        for error in exc.errors()
+    ]
+    return Response(
+        content=orjson.dumps({"detail": errors}),
         status_code=400,
-        content={"detail": exc.errors()},
+        headers=_VALIDATION_HEADERS,
     )
 
 
@@ -280,38 +306,132 @@ async def validation_exception_handler(
 #
 # On n'utilise pas de prefix ici car les routes déclarent leur chemin complet
 # directement dans le router (ex : @router.get("/resume")).
+#
+# Les routers sont listés dans un tuple et enregistrés par une seule boucle :
+# un paramètre commun (ex : prefix="/api/v1") ne se modifie qu'à un endroit.
 # =============================================================================
 
-# Étape 4 — endpoint principal
-app.include_router(resume.router)
-
-# Étape 5 — les 7 endpoints restants (dans l'ordre croissant de complexité)
-app.include_router(dernier_trans.router)        # le plus simple : pas de var
-app.include_router(tx_recours.router)           # type_geo_tx_recours, pas de var
-app.include_router(resume_prec_annee.router)    # multi-année, similaire à /resume
-app.include_router(diag_assoc.router)           # code_diag (CIM-10) + var optionnel
-app.include_router(um.router)                   # code_rum + duree_moy_rum + var
-app.include_router(actes.router)                # code_ccam + colonnes CCAM spécifiques
-app.include_router(dmi_med.router)              # le plus complexe : mix med/dmi
+ROUTERS = (
+    # Étape 4 — endpoint principal
+    resume.router,
+    # Étape 5 — les 7 endpoints restants (dans l'ordre croissant de complexité)
+    dernier_trans.router,        # le plus simple : pas de var
+    tx_recours.router,           # type_geo_tx_recours, pas de var
+    resume_prec_annee.router,    # multi-année, similaire à /resume
+    diag_assoc.router,           # code_diag (CIM-10) + var optionnel
+    um.router,                   # code_rum + duree_moy_rum + var
+    actes.router,                # code_ccam + colonnes CCAM spécifiques
+    dmi_med.router,              # le plus complexe : mix med/dmi
+)
 
 
 # =============================================================================
 # GET / — Endpoint de santé (health check)
 #
-# Le décorateur @app.get("/") déclare un endpoint HTTP GET sur la route racine.
-# La fonction health_check est appelée à chaque requête GET sur "/".
+# La route est une Route Starlette brute (et non une path operation FastAPI
+# comme @app.get("/")), insérée en tête de la table de routage dans
+# create_app() :
+#   - pas de résolution de dépendances ni de validation des paramètres :
+#     la fonction reçoit directement la Request et retourne une Response
+#   - include_in_schema=False : la sonde n'apparaît pas dans /docs ni dans
+#     /openapi.json (elle n'intéresse pas les clients R)
+#   - en index 0, c'est la première route testée par le routeur
+#
+# Le corps de la réponse est constant : il est écrit une fois pour toutes en
+# bytes JSON. Une nouvelle Response est créée à chaque appel : les middlewares
+# (CORS) ajoutent leurs en-têtes sur l'objet réponse, qui ne doit pas être
+# partagé.
+#
+# Doc : https://www.starlette.io/routing/#http-routing
 # =============================================================================
-@app.get(
-    "/",
-    summary="Vérification de l'état de l'API",
-    tags=["Santé"],
-)
-def health_check() -> dict:
+
+# Corps JSON pré-sérialisé de GET /
+_HEALTH_BODY = b'{"status":"ok"}'
+
+
+async def health_check(request: Request) -> Response:
     """
     Endpoint de santé (*health check*).
 
     Retourne un statut `ok` pour confirmer que le serveur est opérationnel.
     Utile pour les scripts de démarrage ou les sondes de liveness en production.
     """
-    # FastAPI convertit automatiquement ce dict Python en JSON : {"status": "ok"}
-    return {"status": "ok"}
+    # Corps JSON déjà sérialisé : {"status": "ok"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
+
+
+# =============================================================================
+# Fabrique d'application — create_app()
+#
+# Toute la configuration de l'application (middlewares, handler d'erreurs,
+# routers, endpoint de santé) est centralisée dans une seule fonction.
+# Le module l'appelle une fois pour exposer `app` (cible de uvicorn) ; un test
+# peut appeler create_app() pour obtenir une instance neuve et indépendante.
+#
+# Doc : https://fastapi.tiangolo.com/tutorial/bigger-applications/
+# =============================================================================
+
+
+def create_app() -> FastAPI:
+    """
+    Construit et configure l'application FastAPI.
+
+    Returns:
+        Une nouvelle instance FastAPI avec middlewares, handler 422→400,
+        routers MCO et endpoint de santé enregistrés.
+
+    Exemples:
+        >>> from fastapi.testclient import TestClient
+        >>> TestClient(create_app()).get("/").json()
+        {'status': 'ok'}
+    """
+    # Instanciation de l'application FastAPI.
+    # Les paramètres title, description et version alimentent la doc Swagger (/docs).
+    # Le paramètre lifespan connecte notre gestionnaire de cycle de vie.
+    #
+    # default_response_class=ORJSONResponse : classe de réponse utilisée par défaut
+    # par tous les endpoints. ORJSONResponse sérialise avec orjson (bibliothèque
+    # compilée) au lieu du module json standard — nettement plus rapide sur nos
+    # réponses composées de nombreuses petites lignes (dicts).
+    # Doc : https://fastapi.tiangolo.com/advanced/custom-response/#use-orjsonresponse
+    application = FastAPI(
+        title="API Mock Activité MCO",
+        description=(
+            "API de simulation des données d'activité MCO (Médecine, Chirurgie, Obstétrique). "
+            "Permet de développer et tester des clients R sans connexion à la base PMSI réelle."
+        ),
+        version="0.1.0",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+    )
+
+    application.add_middleware(
+        CORSMiddleware,
+        # Les origines sont lues depuis la configuration (variable CORS_ORIGINS).
+        # Par défaut "*" pour autoriser tout (utile en dev/démo).
+        allow_origins=get_settings().cors_origins,
+        # allow_credentials=True autoriserait les cookies et les en-têtes Authorization.
+        # On le désactive car cette API mock ne gère pas d'authentification.
+        allow_credentials=False,
+        # Autoriser toutes les méthodes HTTP (GET, POST, OPTIONS, etc.)
+        allow_methods=["*"],
+        # Autoriser tous les en-têtes HTTP
+        allow_headers=["*"],
+    )
+    application.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+    # Équivalent de @app.exception_handler(RequestValidationError)
+    application.add_exception_handler(RequestValidationError, validation_exception_handler)
+
+    for router in ROUTERS:
+        application.include_router(router)
+
+    # Route de santé en tête de table (voir « GET / » plus haut)
+    application.router.routes.insert(
+        0, Route("/", health_check, methods=["GET"], include_in_schema=False)
+    )
+    return application
+
+
+# Instance unique exposée au serveur (uvicorn app.main:app) et aux tests.
+app = create_app()
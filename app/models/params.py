@@ -34,10 +34,40 @@
 #   - FastAPI lit la signature de __init__ pour construire les paramètres
 #     de query string de l'endpoint
 #   - Les attributs self.xxx sont ensuite accessibles dans l'endpoint
+#   - VarParam : paramètre var, déclaré uniquement par les endpoints ventilés
+#
+#   4. Annotated[type, Query(...)] — Paramètre réutilisable
+#      Annotated associe au type les métadonnées de validation et de
+#      documentation. L'alias VarParam se déclare ensuite comme n'importe quel
+#      paramètre d'endpoint : var: VarParam = None.
+#
+#      Doc : https://fastapi.tiangolo.com/tutorial/query-params-str-validations/#use-annotated-in-the-type-for-the-q-parameter
 # =============================================================================
 
+from typing import Annotated
+
 from fastapi import Query
 
+# -----------------------------------------------------------------------------
+# PARAMÈTRE DE VENTILATION
+# Utilisé par 6 des 8 endpoints (absent de /tx_recours et /dernier_trans) :
+# il est déclaré par ces endpoints eux-mêmes plutôt que dans CommonQueryParams,
+# si bien que /tx_recours et /dernier_trans ne l'analysent ni ne l'annoncent
+# dans /docs.
+# Contrôle les colonnes de regroupement dans la réponse JSON.
+# -----------------------------------------------------------------------------
+VarParam = Annotated[
+    str | None,
+    Query(
+        description=(
+            "Variable(s) de ventilation séparées par '_' "
+            "(ex : 'ghm', 'sexe_trancheage', 'mois', 'ghm_typhosp'). "
+            "Chaque variable ajoute une ou plusieurs colonnes de groupement "
+            "à la réponse. Voir la spec §4 pour la liste complète."
+        ),
+    ),
+]
+
 
 class CommonQueryParams:
     """
@@ -49,18 +79,56 @@ class CommonQueryParams:
       - Les filtres établissement (finess, categ, secteur, etc.)
       - Les paramètres géographiques (type_geo_etab, codegeo, etc.)
       - Les paramètres d'authentification (profils_niveau, id_utilisateur, etc.)
-      - Le paramètre de ventilation var (commun à 6 des 8 endpoints)
+
+    Le paramètre de ventilation var n'en fait pas partie : il n'est accepté que
+    par les 6 endpoints qui l'utilisent (voir VarParam ci-dessous).
 
     Utilisation dans un endpoint :
         from fastapi import Depends
         from app.models.params import CommonQueryParams
 
         @app.get("/mon-endpoint")
-        def mon_endpoint(params: CommonQueryParams = Depends()):
+        def mon_endpoint(params: CommonQueryParams = Depends(), var: VarParam = None):
             annee = params.annee  # valeur du query param ?annee=23
-            var = params.var      # valeur du query param ?var=ghm
+            # var : valeur du query param ?var=ghm
     """
 
+    # __slots__ : les attributs sont stockés dans des emplacements fixes
+    # plutôt que dans un __dict__ propre à chaque instance. Une instance est
+    # créée à chaque requête : moins de mémoire allouée et des accès aux
+    # attributs plus directs. FastAPI ne lit que la signature de __init__,
+    # les slots ne changent donc rien aux paramètres de query string.
+    # Doc : https://docs.python.org/3/reference/datamodel.html#slots
+    __slots__ = (
+        # Paramètre obligatoire
+        "annee",
+        # Filtres temporels
+        "moissortie",
+        # Filtres démographiques
+        "sexe", "age",
+        # Type d'hospitalisation
+        "typhosp",
+        # Filtres cliniques
+        "diag", "diag_pos", "acte", "exclu_acte", "and_acte", "and_exclu_acte",
+        # Filtres établissement
+        "um", "finess", "finessgeo", "categ", "secteur",
+        # Modes d'entrée / sortie
+        "modeentree", "modesortie", "provenance", "destination", "passageurg",
+        # Géographie établissement
+        "type_geo_etab", "codes_geo_etab",
+        # Géographie patient
+        "codegeo", "type_geo_pat", "codes_geo_pat",
+        # Médicaments / dispositifs
+        "code_lpp", "code_ucd",
+        # Filtres de casemix
+        "ghm", "racine", "cmd", "dp", "da", "ga", "gp", "aso", "cas",
+        # Authentification
+        "profils_niveau", "profils_entite", "id_utilisateur", "token_utilisateur",
+        "refus_cookie",
+        # Simulation (mock uniquement)
+        "simulate_vide", "simulate_petit_effectif",
+    )
+
     def __init__(
         self,
         # -------------------------------------------------------------------------
@@ -327,20 +395,6 @@ class CommonQueryParams:
             description="Refus des cookies analytiques : 'TRUE' ou 'FALSE'.",
         ),
         # -------------------------------------------------------------------------
-        # PARAMÈTRE DE VENTILATION
-        # Commun à 6 des 8 endpoints (absent de /tx_recours et /dernier_trans).
-        # Contrôle les colonnes de regroupement dans la réponse JSON.
-        # -------------------------------------------------------------------------
-        var: str | None = Query(
-            None,
-            description=(
-                "Variable(s) de ventilation séparées par '_' "
-                "(ex : 'ghm', 'sexe_trancheage', 'mois', 'ghm_typhosp'). "
-                "Chaque variable ajoute une ou plusieurs colonnes de groupement "
-                "à la réponse. Voir la spec §4 pour la liste complète."
-            ),
-        ),
-        # -------------------------------------------------------------------------
         # PARAMÈTRES DE SIMULATION — Étape 6 (gestion des erreurs et petit_effectif)
         #
         # Ces paramètres sont propres au mock : ils permettent de tester les cas
@@ -439,9 +493,6 @@ class CommonQueryParams:
         self.token_utilisateur = token_utilisateur
         self.refus_cookie = refus_cookie
 
-        # --- Ventilation ---
-        self.var = var
-
         # --- Simulation (mock uniquement) ---
         self.simulate_vide = simulate_vide
         self.simulate_petit_effectif = simulate_petit_effectif
@@ -13,30 +13,49 @@
 #      Doc : https://fastapi.tiangolo.com/tutorial/body/#create-your-data-model
 #      Doc Pydantic : https://docs.pydantic.dev/latest/concepts/models/
 #
-#   2. ConfigDict(extra='allow')
+#   2. ConfigDict(extra='ignore')
 #      Par défaut, Pydantic v2 ignore les champs non déclarés dans un modèle.
-#      Avec extra='allow', les champs supplémentaires sont acceptés et conservés.
-#      C'est essentiel ici car les colonnes de ventilation (var=ghm, var=mois, etc.)
-#      sont dynamiques : on ne peut pas les déclarer statiquement dans le modèle.
+#      Les colonnes de ventilation (var=ghm, var=mois, etc.) sont pourtant
+#      dynamiques : on ne peut pas les déclarer statiquement dans le modèle.
+#      Plutôt que extra='allow' (qui stocke chaque champ inconnu dans un dict
+#      annexe, ligne par ligne), le modèle garde un schéma fermé : seules ses
+#      colonnes déclarées passent par Pydantic, et les colonnes de var sont
+#      recopiées telles quelles à la suite (voir rows_json_response()).
+#      Leurs noms viennent du client : on ne construit donc aucun modèle ni
+#      entrée de cache à partir d'eux.
 #
 #      Doc : https://docs.pydantic.dev/latest/concepts/models/#extra-fields
 #
 #   3. response_model dans @app.get()
 #      Quand on déclare response_model=list[ResumeRow], FastAPI :
 #        - Valide que la réponse de la fonction correspond au modèle
-#        - Filtre les champs non déclarés (sauf avec extra='allow')
+#        - Filtre les champs non déclarés
 #        - Génère le schéma de réponse dans la doc Swagger
 #
 #      Doc : https://fastapi.tiangolo.com/tutorial/response-model/
 #
+#   3 bis. TypeAdapter (Pydantic v2)
+#      TypeAdapter(list[ResumeRow]) compile une fois pour toutes le validateur
+#      et le sérialiseur (pydantic-core, écrit en Rust) d'une liste de lignes.
+#      Un adapter est construit par modèle au premier appel, puis réutilisé à
+#      chaque requête (voir row_list_adapter() et rows_json_response() en fin
+#      de fichier).
+#
+#      Doc : https://docs.pydantic.dev/latest/concepts/type_adapter/
+#
 #   4. float | None = None — Champ optionnel
 #      Indique qu'un champ peut être un float ou None (absent).
 #      La valeur par défaut None signifie que le champ n'est pas obligatoire
 #      dans la réponse (par exemple duree_moy_sej peut être absent selon la spec §5.4).
 #
-#   5. int | str — Union de types
+#   5. int | Literal["petit_effectif"] — Union de types
 #      Utilisé pour nb_pat dans ResumeRow : peut être un entier OU la chaîne
 #      "petit_effectif" (protection du secret statistique, spec §5.2).
+#      Literal restreint la branche texte à cette seule valeur : le schéma
+#      documente exactement la chaîne possible, et la validation n'essaie plus
+#      une conversion générique vers str pour chaque ligne.
+#
+#      Doc : https://docs.pydantic.dev/latest/api/standard_library_types/#typingliteral
 #
 # Architecture :
 #   - BaseRow        : colonnes communes à la plupart des endpoints
@@ -48,9 +67,18 @@
 #   - ActesRow       : /actes
 #   - TxRecoursRow   : /tx_recours
 #   - DernierTransRow : /dernier_trans
+#   - row_list_adapter()   : TypeAdapter(list[...]) d'un modèle (mémorisé)
+#   - rows_json_response() : validation + sérialisation d'une liste de lignes
 # =============================================================================
 
-from pydantic import BaseModel, ConfigDict, Field
+from functools import lru_cache
+from typing import Any, Literal
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+
+from app.config import get_settings
 
 
 # =============================================================================
@@ -62,15 +90,16 @@ class BaseRow(BaseModel):
     Colonnes statistiques de base communes aux endpoints MCO principaux.
 
     Toutes les colonnes numériques sont présentes dans la réponse standard.
-    L'option extra='allow' permet d'accepter les colonnes de ventilation
-    dynamiques ajoutées selon le paramètre `var` (ex : 'ghm', 'mois', 'sexe').
+    Les colonnes de ventilation dynamiques ajoutées selon le paramètre `var`
+    (ex : 'ghm', 'mois', 'sexe') ne sont pas déclarées : elles sont ajoutées
+    à la suite des champs du modèle (voir rows_json_response()).
 
     Exemple avec var=ghm : chaque ligne aura aussi un champ "ghm": "05M09T".
-    Ce champ n'est pas déclaré ici mais sera conservé grâce à extra='allow'.
     """
 
-    # extra='allow' : accepte les champs non déclarés (colonnes de ventilation var)
-    model_config = ConfigDict(extra="allow")
+    # extra='ignore' : schéma fermé (comportement par défaut de Pydantic v2,
+    # explicité ici) — les colonnes de var sont ajoutées par rows_json_response()
+    model_config = ConfigDict(extra="ignore")
 
     nb_sej: int = Field(description="Nombre de séjours MCO.")
     # duree_moy_sej peut être absente selon la spec §5.4 — le client ajoute "0" via verif_data()
@@ -97,11 +126,11 @@ class ResumeRow(BaseRow):
       - None si non demandé (bool_nb_pat non fourni et pas de var)
 
     Les colonnes de ventilation (ghm, mois, sexe, trancheage...) sont ajoutées
-    dynamiquement grâce à extra='allow' hérité de BaseRow.
+    dynamiquement à la suite des champs (voir rows_json_response()).
     """
 
-    # nb_pat : int OU "petit_effectif" OU absent — d'où le type int | str | None
-    nb_pat: int | str | None = Field(
+    # nb_pat : int OU "petit_effectif" OU absent
+    nb_pat: int | Literal["petit_effectif"] | None = Field(
         default=None,
         description=(
             "Nombre de patients. "
@@ -204,7 +233,7 @@ class DmiMedRow(BaseModel):
                               code_ucd, lib_ucd, atc1..atc5 sont null.
     """
 
-    model_config = ConfigDict(extra="allow")
+    model_config = ConfigDict(extra="ignore")
 
     datasource: str = Field(
         description="Source des données : 'med' (médicaments) ou 'dmi' (DMI/LPP).",
@@ -262,7 +291,7 @@ class ActesRow(BaseModel):
     tx_dc et nb_pat par rapport à BaseRow — cet endpoint a un schéma propre.
     """
 
-    model_config = ConfigDict(extra="allow")
+    model_config = ConfigDict(extra="ignore")
 
     code_ccam: str = Field(
         description="Code CCAM de l'acte (7 caractères, ex : 'DZQM006').",
@@ -305,7 +334,7 @@ class TxRecoursRow(BaseModel):
     par le paramètre spécifique type_geo_tx_recours.
     """
 
-    model_config = ConfigDict(extra="allow")
+    model_config = ConfigDict(extra="ignore")
 
     typ_geo: str = Field(
         description=(
@@ -366,3 +395,108 @@ class DernierTransRow(BaseModel):
     derniere_transmission: str = Field(
         description="Date de dernière transmission PMSI au format 'YYYY-MM-DD'.",
     )
+
+
+# =============================================================================
+# TYPEADAPTERS — un par modèle de ligne
+# =============================================================================
+
+
+@lru_cache(maxsize=None)
+def row_list_adapter(model: type[BaseModel]) -> TypeAdapter[Any]:
+    """
+    Retourne le TypeAdapter d'une liste de lignes du modèle.
+
+    Le cache n'a pour clé que le modèle : il compte au plus une entrée par
+    endpoint, quelles que soient les colonnes de var demandées par le client.
+
+    Args:
+        model: modèle de ligne de l'endpoint (ex : ResumeRow).
+
+    Returns:
+        TypeAdapter(list[model]) mémorisé par lru_cache.
+
+    Exemples :
+        row_list_adapter(UmRow) → liste de UmRow
+    """
+    return TypeAdapter(list[model])
+
+
+@lru_cache(maxsize=None)
+def _field_defaults(model: type[BaseModel]) -> tuple[tuple[str, Any], ...]:
+    """
+    Retourne les champs du modèle, dans l'ordre de déclaration, avec leur
+    valeur par défaut (None pour un champ obligatoire).
+
+    Utilisé quand la validation est désactivée, pour produire les mêmes clés,
+    dans le même ordre, que la sérialisation par le modèle.
+    """
+    return tuple(
+        (name, None if field.is_required() else field.default)
+        for name, field in model.model_fields.items()
+    )
+
+
+def rows_json_response(
+    model: type[BaseModel],
+    rows: list[dict[str, Any]],
+    *,
+    exclude_none: bool = False,
+) -> Response:
+    """
+    Valide une liste de lignes et la retourne sérialisée en JSON.
+
+    Remplace le pipeline response_model de FastAPI : les endpoints gardent
+    response_model=list[...] pour la documentation (/docs), mais comme ils
+    retournent une Response, FastAPI ne l'applique pas une seconde fois.
+
+    Si la validation est désactivée (VALIDATE_RESPONSES=false, production),
+    les lignes — produites par notre propre générateur — ne passent pas par
+    le modèle : leurs clés sont seulement remises dans l'ordre de ses champs,
+    valeurs par défaut comprises (voir _field_defaults()). Le JSON produit est
+    le même dans les deux cas (vérifié par les tests).
+
+    Les colonnes de ventilation sont les clés de la première ligne qui ne
+    sont pas des champs du modèle (toutes les lignes ont les mêmes clés) :
+    elles ne passent pas par le modèle et sont ajoutées, dans leur ordre,
+    après ses champs.
+
+    Args:
+        model: modèle de ligne de l'endpoint (ex : UmRow).
+        rows: lignes produites par le générateur (liste de dicts).
+        exclude_none: omettre les champs None, comme
+                      response_model_exclude_none=True.
+
+    Returns:
+        Response HTTP 200 dont le corps est le JSON produit par orjson.
+
+    Exemples :
+        rows_json_response(UmRow, generate_um_rows(), exclude_none=True)
+    """
+    var_columns = (
+        [column for column in rows[0] if column not in model.model_fields]
+        if rows
+        else []
+    )
+    if get_settings().validate_responses:
+        adapter = row_list_adapter(model)
+        out_rows = adapter.dump_python(
+            adapter.validate_python(rows), exclude_none=exclude_none
+        )
+    else:
+        defaults = _field_defaults(model)
+        out_rows = [
+            {name: row.get(name, default) for name, default in defaults}
+            for row in rows
+        ]
+        if exclude_none:
+            out_rows = [
+                {key: value for key, value in out.items() if value is not None}
+                for out in out_rows
+            ]
+    for out, row in zip(out_rows, rows):
+        for column in var_columns:
+            value = row[column]
+            if value is not None or not exclude_none:
+                out[column] = value
+    return Response(content=orjson.dumps(out_rows), media_type="application/json")
@@ -16,12 +16,12 @@
 #   is_classant : 1 si l'acte est classant (détermine le GHM), 0 sinon
 # =============================================================================
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 
 from app.generators.mock_data import build_petit_effectif_row_b, generate_actes_rows
-from app.models.params import CommonQueryParams
-from app.models.responses import ActesRow
+from app.models.params import CommonQueryParams, VarParam
+from app.models.responses import ActesRow, rows_json_response
 
 router = APIRouter(tags=["Endpoints MCO"])
 
@@ -34,7 +34,8 @@ router = APIRouter(tags=["Endpoints MCO"])
 )
 def get_actes(
     params: CommonQueryParams = Depends(),
-) -> list[dict]:
+    var: VarParam = None,
+) -> Response:
     """
     Retourne les actes CCAM (Classification Commune des Actes Médicaux) des
     séjours du périmètre. Utilisé par le module Actes classants.
@@ -79,6 +80,7 @@ def get_actes(
         params.simulate_petit_effectif is not None
         and params.simulate_petit_effectif.upper() == "TRUE"
     ):
-        return JSONResponse(content=build_petit_effectif_row_b("code_ccam", "DZQM006"))
+        return ORJSONResponse(content=build_petit_effectif_row_b("code_ccam", "DZQM006"))
 
-    return generate_actes_rows(var=params.var)
+    rows = generate_actes_rows(var=var)
+    return rows_json_response(ActesRow, rows, exclude_none=True)
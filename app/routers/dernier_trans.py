@@ -14,11 +14,11 @@
 #   Doc : https://fastapi.tiangolo.com/tutorial/path-operation-configuration/#tags
 # =============================================================================
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 
 from app.generators.mock_data import generate_dernier_trans_rows
 from app.models.params import CommonQueryParams
-from app.models.responses import DernierTransRow
+from app.models.responses import DernierTransRow, rows_json_response
 
 # Création du router — même tag que les autres endpoints pour les grouper dans Swagger
 router = APIRouter(tags=["Endpoints MCO"])
@@ -31,7 +31,7 @@ router = APIRouter(tags=["Endpoints MCO"])
 )
 def get_dernier_trans(
     params: CommonQueryParams = Depends(),
-) -> list[dict]:
+) -> Response:
     """
     Retourne la date de dernière transmission PMSI pour chaque établissement
     du périmètre. Une ligne par établissement FINESS.
@@ -66,4 +66,5 @@ def get_dernier_trans(
         )
 
     # Appel direct au générateur — pas de var, pas de logique petit_effectif
-    return generate_dernier_trans_rows(annee_param=params.annee)
+    rows = generate_dernier_trans_rows(annee_param=params.annee)
+    return rows_json_response(DernierTransRow, rows)
@@ -15,12 +15,12 @@
 #   dans la même section de la doc Swagger (/docs).
 # =============================================================================
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 
 from app.generators.mock_data import build_petit_effectif_row_b, generate_diag_assoc_rows
-from app.models.params import CommonQueryParams
-from app.models.responses import DiagAssocRow
+from app.models.params import CommonQueryParams, VarParam
+from app.models.responses import DiagAssocRow, rows_json_response
 
 router = APIRouter(tags=["Endpoints MCO"])
 
@@ -33,7 +33,8 @@ router = APIRouter(tags=["Endpoints MCO"])
 )
 def get_diag_assoc(
     params: CommonQueryParams = Depends(),
-) -> list[dict]:
+    var: VarParam = None,
+) -> Response:
     """
     Retourne les diagnostics associés significatifs (DAS) des séjours
     du périmètre. Utilisé par le module DAS.
@@ -75,6 +76,7 @@ def get_diag_assoc(
         params.simulate_petit_effectif is not None
         and params.simulate_petit_effectif.upper() == "TRUE"
     ):
-        return JSONResponse(content=build_petit_effectif_row_b("code_diag", "I10"))
+        return ORJSONResponse(content=build_petit_effectif_row_b("code_diag", "I10"))
 
-    return generate_diag_assoc_rows(var=params.var)
+    rows = generate_diag_assoc_rows(var=var)
+    return rows_json_response(DiagAssocRow, rows, exclude_none=True)
@@ -27,12 +27,12 @@
 #   hiera : code de la catégorie LPP (ex : "04" = Implants articulaires)
 # =============================================================================
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 
 from app.generators.mock_data import build_petit_effectif_row_b, generate_dmi_med_rows
-from app.models.params import CommonQueryParams
-from app.models.responses import DmiMedRow
+from app.models.params import CommonQueryParams, VarParam
+from app.models.responses import DmiMedRow, rows_json_response
 
 router = APIRouter(tags=["Endpoints MCO"])
 
@@ -48,7 +48,8 @@ router = APIRouter(tags=["Endpoints MCO"])
 )
 def get_dmi_med(
     params: CommonQueryParams = Depends(),
-) -> list[dict]:
+    var: VarParam = None,
+) -> Response:
     """
     Retourne les données de valorisation des médicaments onéreux (UCD) et
     des dispositifs médicaux implantables (DMI/LPP). Utilisé par le module
@@ -99,6 +100,7 @@ def get_dmi_med(
         params.simulate_petit_effectif is not None
         and params.simulate_petit_effectif.upper() == "TRUE"
     ):
-        return JSONResponse(content=build_petit_effectif_row_b("datasource", "med"))
+        return ORJSONResponse(content=build_petit_effectif_row_b("datasource", "med"))
 
-    return generate_dmi_med_rows(var=params.var)
+    rows = generate_dmi_med_rows(var=var)
+    return rows_json_response(DmiMedRow, rows, exclude_none=True)
@@ -35,22 +35,23 @@
 #      Déclarer response_model=list[ResumeRow] a plusieurs effets :
 #        - Validation sortante : FastAPI vérifie que la réponse correspond
 #        - Filtrage : les champs non déclarés dans ResumeRow sont retirés
-#          (sauf ceux tolérés par extra='allow' dans BaseRow)
+#          (les colonnes de var sont ajoutées après les champs du modèle,
+#          voir rows_json_response() dans app/models/responses.py)
 #        - Documentation : le schéma de réponse apparaît dans /docs
 #
 # Architecture de l'endpoint :
 #   1. FastAPI parse les query params et injecte CommonQueryParams + params spécifiques
 #   2. Le bool_nb_pat est converti de str ("TRUE"/"FALSE") en bool Python
 #   3. generate_resume_rows() est appelé avec les paramètres pertinents
-#   4. FastAPI sérialise la liste de dicts en JSON et retourne HTTP 200
+#   4. La liste est validée et sérialisée en JSON par un TypeAdapter (HTTP 200)
 # =============================================================================
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
 
 from app.generators.mock_data import generate_resume_rows, parse_var
-from app.models.params import CommonQueryParams
-from app.models.responses import ResumeRow
+from app.models.params import CommonQueryParams, VarParam
+from app.models.responses import ResumeRow, rows_json_response
 
 # -----------------------------------------------------------------------------
 # Concept FastAPI — HTTPException (étape 6)
@@ -100,6 +101,8 @@ def get_resume(
     # CommonQueryParams regroupe les ~35 paramètres de filtrage partagés
     # par tous les endpoints. Depends() construit l'instance automatiquement.
     params: CommonQueryParams = Depends(),
+    # --- Paramètre de ventilation (commun aux endpoints ventilés) ---
+    var: VarParam = None,
     # --- Paramètres spécifiques à /resume ---
     # Ces deux paramètres ne sont pas dans CommonQueryParams car ils ne
     # s'appliquent qu'à cet endpoint (spec §2.4).
@@ -121,7 +124,7 @@ def get_resume(
             "Si absent, des bornes standard sont appliquées."
         ),
     ),
-) -> list[dict]:
+) -> Response:
     """
     Endpoint principal et polyvalent de l'API MCO.
 
@@ -193,9 +196,9 @@ def get_resume(
         params.simulate_petit_effectif is not None
         and params.simulate_petit_effectif.upper() == "TRUE"
     )
-    if simulate_pe and include_nb_pat and params.var is None:
+    if simulate_pe and include_nb_pat and var is None:
         # Retour Méthode A : nb_sej faible, nb_pat = chaîne "petit_effectif"
-        return JSONResponse(
+        return ORJSONResponse(
             content=[
                 {
                     "nb_sej": 5,
@@ -210,11 +213,11 @@ def get_resume(
 
     # Déléguer la génération de données au module generators/mock_data.py.
     # On passe :
-    #   - params.var    : la chaîne de ventilation (ex : "ghm", "sexe_trancheage")
-    #   - trancheage    : les bornes de découpage pour les tranches d'âge
+    #   - var            : la chaîne de ventilation (ex : "ghm", "sexe_trancheage")
+    #   - trancheage     : les bornes de découpage pour les tranches d'âge
     #   - include_nb_pat : si True, inclure nb_pat dans la réponse sans var
     rows = generate_resume_rows(
-        var=params.var,
+        var=var,
         trancheage_param=trancheage,
         bool_nb_pat=include_nb_pat,
     )
@@ -225,13 +228,15 @@ def get_resume(
     # La réponse DMS contient uniquement {"duree": N, "nb_sej": X} par ligne,
     # sans les colonnes statistiques habituelles (tx_dc, tx_male, age_moy).
     # Ce format ne satisfait pas la validation de ResumeRow (qui requiert ces
-    # champs), donc on retourne une JSONResponse directement.
+    # champs), donc on retourne une ORJSONResponse directement.
     #
-    # Concept : JSONResponse
-    #   Retourner une JSONResponse au lieu d'un dict/list Python permet de
+    # Concept : ORJSONResponse (sous-classe de JSONResponse)
+    #   Retourner une Response au lieu d'un dict/list Python permet de
     #   contourner la validation et la sérialisation de response_model.
     #   FastAPI détecte le type de retour et n'applique pas response_model
     #   quand la fonction retourne une Response (ou sous-classe comme JSONResponse).
+    #   ORJSONResponse sérialise avec orjson, comme la classe de réponse par
+    #   défaut de l'application (default_response_class dans app/main.py).
     #
     #   Cas d'usage typiques :
     #     - Schéma de réponse variable selon les paramètres (notre cas)
@@ -240,11 +245,12 @@ def get_resume(
     #
     #   Doc : https://fastapi.tiangolo.com/advanced/custom-response/
     # -------------------------------------------------------------------------
-    var_tokens = parse_var(params.var)
-    if var_tokens == ["duree"]:
+    var_tokens = parse_var(var)
+    if var_tokens == ("duree",):
         # content= doit être un objet JSON-sérialisable (dict, list, str, int...)
-        return JSONResponse(content=rows)
+        return ORJSONResponse(content=rows)
 
-    # Pour tous les autres cas, FastAPI sérialise la liste de dicts via
-    # response_model=list[ResumeRow] et response_model_exclude_none=True.
-    return rows
+    # Pour tous les autres cas, la liste est validée puis sérialisée en JSON
+    # par le TypeAdapter du modèle (voir app/models/responses.py), en une seule
+    # passe Rust. exclude_none=True reproduit response_model_exclude_none=True.
+    return rows_json_response(ResumeRow, rows, exclude_none=True)
@@ -17,12 +17,12 @@
 #   Doc : https://fastapi.tiangolo.com/tutorial/bigger-applications/
 # =============================================================================
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
 
 from app.generators.mock_data import build_petit_effectif_row_b, generate_resume_prec_annee_rows
-from app.models.params import CommonQueryParams
-from app.models.responses import ResumePrecAnneeRow
+from app.models.params import CommonQueryParams, VarParam
+from app.models.responses import ResumePrecAnneeRow, rows_json_response
 
 router = APIRouter(tags=["Endpoints MCO"])
 
@@ -38,6 +38,7 @@ router = APIRouter(tags=["Endpoints MCO"])
 )
 def get_resume_prec_annee(
     params: CommonQueryParams = Depends(),
+    var: VarParam = None,
     # Le paramètre trancheage est spécifique aux cas var=sexe_trancheage,
     # identique à /resume. Réutilisé ici pour la cohérence.
     trancheage: str | None = Query(
@@ -48,7 +49,7 @@ def get_resume_prec_annee(
             "Utilisé conjointement avec `var=sexe_trancheage`."
         ),
     ),
-) -> list[dict]:
+) -> Response:
     """
     Retourne les agrégats de séjours sur les 5 dernières années pour l'analyse
     multi-annuelle.
@@ -88,10 +89,11 @@ def get_resume_prec_annee(
         params.simulate_petit_effectif is not None
         and params.simulate_petit_effectif.upper() == "TRUE"
     ):
-        return JSONResponse(content=build_petit_effectif_row_b("annee", "2023"))
+        return ORJSONResponse(content=build_petit_effectif_row_b("annee", "2023"))
 
-    return generate_resume_prec_annee_rows(
-        var=params.var,
+    rows = generate_resume_prec_annee_rows(
+        var=var,
         annee_param=params.annee,
         trancheage_param=trancheage,
     )
+    return rows_json_response(ResumePrecAnneeRow, rows, exclude_none=True)
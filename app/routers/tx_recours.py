@@ -14,11 +14,11 @@
 #   Doc : https://fastapi.tiangolo.com/tutorial/query-params-str-validations/
 # =============================================================================
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
 from app.generators.mock_data import generate_tx_recours_rows
 from app.models.params import CommonQueryParams
-from app.models.responses import TxRecoursRow
+from app.models.responses import TxRecoursRow, rows_json_response
 
 router = APIRouter(tags=["Endpoints MCO"])
 
@@ -40,7 +40,7 @@ def get_tx_recours(
             "'zon' (zone ARS), 'ts' (territoire de santé), 'geo' (communes/IRIS)."
         ),
     ),
-) -> list[dict]:
+) -> Response:
     """
     Retourne les taux de recours géographiques : nombre de séjours et de
     patients rapporté à 1000 habitants, par zone géographique.
@@ -84,4 +84,5 @@ def get_tx_recours(
             detail="Aucun séjour ne correspond aux critères de filtrage.",
         )
 
-    return generate_tx_recours_rows(type_geo=type_geo_tx_recours)
+    rows = generate_tx_recours_rows(type_geo=type_geo_tx_recours)
+    return rows_json_response(TxRecoursRow, rows)
@@ -14,12 +14,12 @@
 # La colonne code_rum est renommée en 'um' côté client R.
 # =============================================================================
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 
 from app.generators.mock_data import build_petit_effectif_row_b, generate_um_rows
-from app.models.params import CommonQueryParams
-from app.models.responses import UmRow
+from app.models.params import CommonQueryParams, VarParam
+from app.models.responses import UmRow, rows_json_response
 
 router = APIRouter(tags=["Endpoints MCO"])
 
@@ -32,7 +32,8 @@ router = APIRouter(tags=["Endpoints MCO"])
 )
 def get_um(
     params: CommonQueryParams = Depends(),
-) -> list[dict]:
+    var: VarParam = None,
+) -> Response:
     """
     Retourne les données d'activité par type d'unité médicale (UM).
     Utilisé par le module UM.
@@ -85,6 +86,7 @@ def get_um(
         params.simulate_petit_effectif is not None
         and params.simulate_petit_effectif.upper() == "TRUE"
     ):
-        return JSONResponse(content=build_petit_effectif_row_b("code_rum", "01"))
+        return ORJSONResponse(content=build_petit_effectif_row_b("code_rum", "01"))
 
-    return generate_um_rows(var=params.var)
+    rows = generate_um_rows(var=var)
+    return rows_json_response(UmRow, rows, exclude_none=True)
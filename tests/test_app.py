@@ -0,0 +1,153 @@
+# =============================================================================
+# tests/test_app.py — Tests transverses de l'application (app/main.py)
+#
+# Ces tests ne portent pas sur un endpoint en particulier mais sur ce que
+# toutes les réponses partagent : middlewares (GZip, CORS), fabrique
+# create_app(), schéma OpenAPI et sérialisation des lignes
+# (app/models/responses.py).
+#
+#   monkeypatch (fixture pytest intégrée)
+#      Remplace temporairement un attribut (ici get_settings ou le générateur
+#      partagé _DEFAULT_RNG) le temps d'un test ; la valeur d'origine est
+#      restaurée automatiquement à la fin du test.
+#
+#      Doc : https://docs.pytest.org/en/stable/how-to/monkeypatch.html
+#
+# Organisation des tests :
+#   - compression gzip des réponses (GZipMiddleware)
+#   - fabrique d'application create_app() et schéma OpenAPI
+#   - en-têtes CORS (CORSMiddleware)
+#   - corps des erreurs 400 (validation_exception_handler)
+#   - sérialisation des réponses, avec ou sans VALIDATE_RESPONSES
+# =============================================================================
+
+import random
+
+from fastapi.testclient import TestClient
+
+
+# =============================================================================
+# Tests — compression gzip des réponses (GZipMiddleware)
+# =============================================================================
+
+
+def test_resume_reponse_volumineuse_compressee(client: TestClient) -> None:
+    """Une réponse de plus de 1 Ko est compressée en gzip si le client l'accepte."""
+    response = client.get(
+        "/resume",
+        params={"annee": "23", "var": "ghm_finess"},
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.headers.get("content-encoding") == "gzip"
+    # httpx décompresse automatiquement : le JSON reste lisible
+    assert len(response.json()) > 0
+
+
+def test_health_check_petite_reponse_non_compressee(client: TestClient) -> None:
+    """Sous le seuil minimum_size, la réponse est envoyée sans compression."""
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+# =============================================================================
+# Tests — fabrique d'application create_app()
+# =============================================================================
+
+
+def test_create_app_instance_independante() -> None:
+    """create_app() renvoie une application neuve, distincte de app.main.app."""
+    from app.main import app, create_app
+
+    nouvelle = create_app()
+    assert nouvelle is not app
+    assert TestClient(nouvelle).get("/").json() == {"status": "ok"}
+
+
+def test_health_check_absent_du_schema_openapi(client: TestClient) -> None:
+    """La sonde GET / reste accessible mais n'apparaît pas dans /openapi.json."""
+    assert client.get("/").json() == {"status": "ok"}
+    assert "/" not in client.get("/openapi.json").json()["paths"]
+
+
+# =============================================================================
+# Tests — CORSMiddleware
+# =============================================================================
+
+
+def test_cors_en_tete_allow_origin(client: TestClient) -> None:
+    """Avec CORS_ORIGINS par défaut (« * »), toute origine reçoit l'en-tête CORS."""
+    response = client.get("/", headers={"Origin": "https://shiny.example.fr"})
+    assert response.headers["access-control-allow-origin"] == "*"
+
+
+# =============================================================================
+# Tests — gestionnaire des erreurs de validation (422 → 400)
+# =============================================================================
+
+
+def test_erreur_validation_cles_reduites(client: TestClient) -> None:
+    """Le corps d'erreur 400 ne contient que type, loc et msg (ni input ni ctx)."""
+    response = client.get("/um", params={"annee": "2023"})
+    assert response.status_code == 400
+    for error in response.json()["detail"]:
+        assert set(error) == {"type", "loc", "msg"}
+
+
+# =============================================================================
+# Tests — sérialisation des réponses (row_list_adapter, VALIDATE_RESPONSES)
+# =============================================================================
+
+
+def test_row_list_adapter_une_entree_par_modele(client: TestClient) -> None:
+    """Les colonnes de var choisies par le client n'ajoutent aucune entrée au cache."""
+    from app.models.responses import row_list_adapter
+
+    client.get("/resume", params={"annee": "23", "var": "ghm"})
+    taille = row_list_adapter.cache_info().currsize
+    for var in ("sexe", "mois", "ghm,sexe", "copy"):
+        assert client.get("/resume", params={"annee": "23", "var": var}).status_code == 200
+    assert row_list_adapter.cache_info().currsize == taille
+
+
+def test_rows_json_response_sans_validation(monkeypatch) -> None:
+    """VALIDATE_RESPONSES=false : clés dans l'ordre du modèle, colonnes de var à la fin."""
+    from app.config import Settings
+    from app.models import responses
+
+    monkeypatch.setattr(
+        responses, "get_settings", lambda: Settings(validate_responses=False)
+    )
+    rows = [{"ghm": "05M09T", "nb_pat": None, "nb_sej": 12}]
+    response = responses.rows_json_response(responses.ResumeRow, rows, exclude_none=True)
+    assert response.body == b'[{"nb_sej":12,"ghm":"05M09T"}]'
+
+
+def test_reponse_identique_avec_ou_sans_validation(client: TestClient, monkeypatch) -> None:
+    """VALIDATE_RESPONSES=true et false renvoient exactement le même JSON, pour chaque endpoint."""
+    from app.config import Settings
+    from app.generators import mock_data
+    from app.models import responses
+
+    requetes = [
+        ("/resume", {"var": "sexe"}),
+        ("/resume", {"bool_nb_pat": "TRUE"}),
+        ("/resume_prec_annee", {"var": "ghm"}),
+        ("/diag_assoc", {"var": "dr"}),
+        ("/um", {"var": "finess"}),
+        ("/dmi_med", {"var": "ghm"}),
+        ("/actes", {"var": "dr"}),
+        ("/tx_recours", {}),
+        ("/dernier_trans", {}),
+    ]
+    for url, params in requetes:
+        corps = []
+        for validate in (True, False):
+            monkeypatch.setattr(
+                responses, "get_settings", lambda v=validate: Settings(validate_responses=v)
+            )
+            monkeypatch.setattr(mock_data, "_DEFAULT_RNG", random.Random(5))
+            response = client.get(url, params={"annee": "23", **params})
+            assert response.status_code == 200, url
+            corps.append(response.content)
+        assert corps[0] == corps[1], url
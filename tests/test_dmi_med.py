@@ -190,3 +190,14 @@ def test_dmi_med_petit_effectif_methode_b(client: TestClient) -> None:
     assert "datasource" in row
     for value in row.values():
         assert isinstance(value, str), f"Valeur non-string trouvée : {value!r}"
+
+
+def test_dmi_med_var_homonyme_de_l_axe(client: TestClient) -> None:
+    """var=code ou var=datasource n'écrase pas l'axe datasource/code (régression)."""
+    for var in ("code", "datasource"):
+        response = client.get("/dmi_med", params={"annee": "23", "var": var})
+        assert response.status_code == 200
+        for row in response.json():
+            assert row["datasource"] in {"med", "dmi"}
+            code_attendu = row["code_ucd"] if row["datasource"] == "med" else row["code_lpp"]
+            assert row["code"] == code_attendu
@@ -0,0 +1,230 @@
+# =============================================================================
+# tests/test_mock_data.py — Tests unitaires du module app/generators/mock_data.py
+#
+# Contrairement aux autres fichiers de tests, on n'utilise pas le client HTTP :
+# les fonctions du générateur sont appelées directement. Cela permet de
+# vérifier finement les utilitaires de parsing (parse_var, parse_trancheage...)
+# indépendamment des endpoints.
+# =============================================================================
+
+import os
+import random
+import subprocess
+import sys
+from itertools import product
+
+from app.generators.mock_data import (
+    _build_var_rows,
+    _expand_var_columns,
+    _sample_var_columns,
+    generate_base_columns,
+    generate_dmi_med_rows,
+    get_var_values,
+    parse_trancheage,
+    parse_var,
+    warmup,
+)
+
+
+# =============================================================================
+# Tests de parse_var()
+# =============================================================================
+
+
+def test_parse_var_vide() -> None:
+    """None ou chaîne vide → aucun token."""
+    assert parse_var(None) == ()
+    assert parse_var("") == ()
+
+
+def test_parse_var_simple() -> None:
+    """Les vars simples sont découpés sur '_'."""
+    assert parse_var("ghm") == ("ghm",)
+    assert parse_var("ghm_mois") == ("ghm", "mois")
+
+
+def test_parse_var_compose() -> None:
+    """Les noms composés sont reconnus comme un seul token, où qu'ils soient."""
+    assert parse_var("sexe_trancheage") == ("sexe_trancheage",)
+    assert parse_var("sexe_trancheage_ghm") == ("sexe_trancheage", "ghm")
+    assert parse_var("ghm_sexe_trancheage") == ("ghm", "sexe_trancheage")
+    assert parse_var("modentprov_modsordest") == ("modentprov_modsordest",)
+
+
+def test_parse_var_prefixe_compose() -> None:
+    """Un nom composé suivi d'autres caractères n'est pas reconnu comme tel."""
+    assert parse_var("sexe_trancheagex") == ("sexe", "trancheagex")
+
+
+# =============================================================================
+# Tests de parse_trancheage()
+# =============================================================================
+
+
+def test_parse_trancheage_bornes() -> None:
+    """Les bornes produisent une tranche par intervalle + une tranche finale."""
+    assert parse_trancheage("10_20_30") == (
+        "[0-10 ans]", "[11-20 ans]", "[21-30 ans]", "[31 ans et +]",
+    )
+
+
+def test_parse_trancheage_defaut() -> None:
+    """Sans bornes, la pyramide standard compte 10 tranches."""
+    assert len(parse_trancheage(None)) == 10
+
+
+def test_parse_trancheage_defaut_identique_bornes_standard() -> None:
+    """Les labels par défaut correspondent aux bornes standard 10 à 90."""
+    assert parse_trancheage(None) == parse_trancheage("10_20_30_40_50_60_70_80_90")
+
+
+# =============================================================================
+# Tests de _expand_var_columns()
+# =============================================================================
+
+
+def test_expand_var_columns_ordre_product() -> None:
+    """Les colonnes reproduisent l'ordre des combinaisons de itertools.product."""
+    values = [("1", "2"), ("M", "C", "O"), ((8, 4), (7, 1))]
+    columns = [("sexe",), ("typhosp",), ("modentprov", "modsordest")]
+    n_rows, var_columns = _expand_var_columns(values, columns)
+
+    attendu = list(product(*values))
+    assert n_rows == len(attendu)
+    assert list(zip(
+        var_columns["sexe"],
+        var_columns["typhosp"],
+        zip(var_columns["modentprov"], var_columns["modsordest"]),
+    )) == attendu
+
+
+def test_sample_var_columns_plafonne() -> None:
+    """Au-delà de max_rows, on garde max_rows combinaisons distinctes du produit."""
+    values = [tuple(range(10)), ("a", "b", "c"), ((1, "x"), (2, "y"))]
+    columns = [("mois",), ("typhosp",), ("sexe", "trancheage")]
+    n_rows, var_columns = _sample_var_columns(random.Random(0), values, columns, max_rows=7)
+
+    assert n_rows == 7
+    combos = list(zip(
+        var_columns["mois"],
+        var_columns["typhosp"],
+        zip(var_columns["sexe"], var_columns["trancheage"]),
+    ))
+    assert len(set(combos)) == 7
+    # Les combinaisons retenues sont celles de product(), dans le même ordre
+    tout = list(product(*values))
+    assert set(combos) <= set(tout)
+    assert combos == sorted(combos, key=tout.index)
+
+
+def test_sample_var_columns_sous_le_plafond() -> None:
+    """Sous max_rows, le produit complet est renvoyé (comme _expand_var_columns)."""
+    values = [("1", "2"), ("M", "C")]
+    columns = [("sexe",), ("typhosp",)]
+    assert _sample_var_columns(random.Random(0), values, columns) == (
+        _expand_var_columns(values, columns)
+    )
+
+
+def test_build_var_rows_sans_var_plafonne() -> None:
+    """Sans var, une dimension primaire de plus de 100 codes est elle aussi plafonnée."""
+    codes = [f"C{i:03d}" for i in range(250)]
+    rows = _build_var_rows(
+        random.Random(0), (), generate_base_columns, ("code_diag", codes),
+    )
+    assert len(rows) == 100
+    assert len({row["code_diag"] for row in rows}) == 100
+
+
+# =============================================================================
+# Tests de get_var_values()
+# =============================================================================
+
+
+def test_get_var_values_sexe_trancheage_defaut() -> None:
+    """Sans trancheage, la table précalculée donne sexe × 10 tranches standard."""
+    values = get_var_values("sexe_trancheage")
+    assert len(values) == 2 * 10
+    assert values[0] == ("1", "[0-10 ans]")
+
+
+def test_get_var_values_sexe_trancheage_personnalise() -> None:
+    """Des bornes personnalisées court-circuitent la table par défaut."""
+    values = get_var_values("sexe_trancheage", "20_60")
+    assert [tranche for sexe, tranche in values if sexe == "1"] == [
+        "[0-20 ans]", "[21-60 ans]", "[61 ans et +]",
+    ]
+
+
+def test_get_var_values_token_inconnu() -> None:
+    """Un token inconnu produit des valeurs génériques."""
+    assert get_var_values("inconnu") == ("inconnu_val1", "inconnu_val2", "inconnu_val3")
+
+
+# =============================================================================
+# Tests de warmup()
+# =============================================================================
+
+
+def test_warmup_remplit_les_caches() -> None:
+    """Après warmup(), les valeurs des tokens par défaut sont servies par le cache."""
+    get_var_values.cache_clear()
+    warmup()
+    hits = get_var_values.cache_info().hits
+    get_var_values("ghm")
+    assert get_var_values.cache_info().hits == hits + 1
+
+
+# =============================================================================
+# Tests du générateur partagé (_DEFAULT_RNG)
+# =============================================================================
+
+
+def _demarrage(code: str) -> str:
+    """Exécute code dans un nouvel interpréteur avec RANDOM_SEED=7 et retourne sa sortie."""
+    env = {**os.environ, "RANDOM_SEED": "7"}
+    return subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+    ).stdout
+
+
+def test_default_rng_reproductible_avec_random_seed() -> None:
+    """Après warmup(), deux démarrages avec RANDOM_SEED produisent les mêmes lignes sans seed explicite."""
+    code = (
+        "from app.generators import mock_data; mock_data.warmup(); "
+        "print(mock_data.generate_resume_rows('sexe'))"
+    )
+    assert _demarrage(code) == _demarrage(code)
+
+
+def test_import_ne_lit_pas_la_configuration() -> None:
+    """Importer le générateur ne construit pas Settings (lecture paresseuse de la config)."""
+    code = (
+        "import app.generators.mock_data; from app.config import get_settings; "
+        "print(get_settings.cache_info().misses)"
+    )
+    assert _demarrage(code).strip() == "0"
+
+
+# =============================================================================
+# Tests de generate_dmi_med_rows()
+# =============================================================================
+
+
+def test_dmi_med_repartition_independante_de_l_ordre(monkeypatch) -> None:
+    """Les lignes med/dmi sont réparties selon datasource, même si les lignes dmi viennent d'abord."""
+    from app.generators import mock_data
+
+    def echantillon_inverse(rng, all_var_values, all_var_columns):
+        n_rows, columns = _expand_var_columns(all_var_values, all_var_columns)
+        return n_rows, {col: values[::-1] for col, values in columns.items()}
+
+    monkeypatch.setattr(mock_data, "_sample_var_columns", echantillon_inverse)
+    rows = generate_dmi_med_rows(seed=0)
+
+    assert {row["datasource"] for row in rows} == {"med", "dmi"}
+    for row in rows:
+        if row["datasource"] == "med":
+            assert row["code_ucd"] == row["code"] and row["code_lpp"] is None
+        else:
+            assert row["code_lpp"] == row["code"] and row["code_ucd"] is None
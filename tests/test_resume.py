@@ -346,6 +346,13 @@ def test_resume_var_combine(client: TestClient) -> None:
         assert "typhosp" in row
 
 
+def test_resume_var_nom_reserve_pydantic(client: TestClient) -> None:
+    """Un token de var homonyme d'un attribut de BaseModel reste une colonne normale."""
+    response = client.get("/resume", params={"annee": "23", "var": "copy"})
+    assert response.status_code == 200
+    assert all("copy" in row for row in response.json())
+
+
 # =============================================================================
 # Tests des colonnes de base et des plages de valeurs
 # =============================================================================
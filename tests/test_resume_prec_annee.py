@@ -146,3 +146,10 @@ def test_resume_prec_annee_petit_effectif_methode_b(client: TestClient) -> None:
     row = data[0]
     for value in row.values():
         assert isinstance(value, str), f"Valeur non-string trouvée : {value!r}"
+
+
+def test_resume_prec_annee_var_annee(client: TestClient) -> None:
+    """var=annee n'écrase pas la dimension primaire annee (régression)."""
+    response = client.get("/resume_prec_annee", params={"annee": "23", "var": "annee"})
+    assert response.status_code == 200
+    assert all(isinstance(row["annee"], int) for row in response.json())
@@ -161,3 +161,11 @@ def test_tx_recours_404_perimetre_vide(client: TestClient) -> None:
     )
     assert response.status_code == 404
     assert "detail" in response.json()
+
+
+def test_tx_recours_sans_parametre_var(client: TestClient) -> None:
+    """/tx_recours n'utilise pas var : le paramètre n'apparaît pas dans /docs."""
+    schema = client.get("/openapi.json").json()
+    noms = {p["name"] for p in schema["paths"]["/tx_recours"]["get"]["parameters"]}
+    assert "var" not in noms
+    assert "annee" in noms